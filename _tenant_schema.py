@@ -0,0 +1,117 @@
+# _tenant_schema.py
+"""PRAGMA table_info(tenant) helpers shared by the seed_tenant_* scripts."""
+import sqlite3
+from collections import namedtuple
+
+TEXT_LIKE = frozenset({"TEXT", "VARCHAR", "NVARCHAR", "CHAR", "CLOB"})
+NUM_LIKE = frozenset({"INTEGER", "INT", "BIGINT", "REAL", "FLOAT", "NUMERIC", "DECIMAL"})
+
+TIMESTAMP_COLS = ("created_at", "updated_at", "createdAt", "updatedAt", "inserted_at")
+DATETIME_LIKE = frozenset({"DATETIME", "TIMESTAMP", "DATE"})
+
+# "now" computed by SQLite inside the INSERT rather than bound from Python
+NOW_SQL = "strftime('%Y-%m-%d %H:%M:%S','now')"  # how SQLAlchemy stores DATETIME on SQLite
+NOW_ISO = "strftime('%Y-%m-%dT%H:%M:%S+00:00','now')"
+NOW_EPOCH = "CAST(strftime('%s','now') AS INTEGER)"
+
+# base_type: upper-cased declared type without size, e.g. VARCHAR(64) -> VARCHAR
+# is_text: text-like or untyped (""), which SQLite stores as text too
+Col = namedtuple("Col", "name base_type notnull dflt pk is_text is_num")
+
+
+def connect(db):
+    """Open `db` for a one-off seed: per-connection PRAGMAs in one executescript."""
+    con = sqlite3.connect(db)
+    # synchronous/temp_store are per connection; journal_mode is left alone
+    # because it is stored in the file and would change it for the app too
+    con.executescript(
+        """
+        PRAGMA synchronous=NORMAL;
+        PRAGMA temp_store=MEMORY;
+        """
+    )
+    return con
+
+
+def tenant_columns(cur) -> list[Col]:
+    """One PRAGMA read; every type decision the seed scripts need is precomputed."""
+    out = []
+    for _cid, name, coltype, notnull, dflt, pk in cur.execute("PRAGMA table_info(tenant)"):
+        bt = (coltype or "").upper().partition("(")[0].strip()
+        out.append(Col(name, bt, notnull, dflt, pk, bt in TEXT_LIKE or bt == "", bt in NUM_LIKE))
+    return out
+
+
+def seed_tenant(con, slug="default", *, extra_values=None):
+    """
+    Insert a tenant row with `slug` on `con`, filling NOT NULL columns that have
+    no DB default. No-op if the slug already exists. The caller owns `con`.
+    """
+    cur = con.cursor()
+    cols = tenant_columns(cur)
+    if not cols:
+        raise SystemExit("tenant table not found")
+
+    by_name = {c.name: c for c in cols}
+    has_slug = "slug" in by_name
+    unknown = [k for k in (extra_values or {}) if k not in by_name]
+    if unknown:
+        raise SystemExit(f"unknown tenant column(s): {', '.join(unknown)}")
+    if has_slug:
+        row = cur.execute("SELECT rowid FROM tenant WHERE slug = ?", (slug,)).fetchone()
+        if row:
+            print(f"✅ tenant row already exists with slug='{slug}' (reusing):", row[0])
+            return
+
+    values = {}  # bound parameters
+    exprs = {}  # column -> ":param" or SQL expression, in column order
+
+    def put(name, value):
+        values[name] = value
+        exprs[name] = ":" + name
+
+    first_text_col = None  # carries the slug when there is no slug column
+    for c in cols:
+        name = c.name
+        if first_text_col is None and c.is_text:
+            first_text_col = name
+        if name == "slug":
+            put(name, slug)
+        elif c.pk and not c.is_text:
+            # INTEGER PRIMARY KEY: let SQLite assign the rowid
+            pass
+        elif c.dflt is not None:
+            # let DB apply its default
+            pass
+        elif c.notnull:
+            if name in TIMESTAMP_COLS:
+                if c.base_type in DATETIME_LIKE:
+                    exprs[name] = NOW_SQL
+                elif c.is_text or c.base_type == "NUMERIC":
+                    exprs[name] = NOW_ISO
+                else:
+                    exprs[name] = NOW_EPOCH
+            elif c.base_type in DATETIME_LIKE:
+                exprs[name] = NOW_SQL
+            else:
+                # BOOLEAN and other numeric-affinity types take 0
+                put(name, "" if c.is_text else 0)
+
+    if not has_slug and first_text_col is not None:
+        put(first_text_col, slug)
+    for name, value in (extra_values or {}).items():
+        put(name, value)
+
+    # Build insert with only the columns we set
+    names = ",".join(exprs.keys())
+    qs = ",".join(exprs.values())
+    sql = f"INSERT INTO tenant ({names}) VALUES ({qs})"
+
+    try:
+        cur.execute("BEGIN IMMEDIATE")
+        cur.execute(sql, values)
+        con.commit()
+        print("✅ inserted tenant with:", {k: values.get(k, e) for k, e in exprs.items()})
+    except Exception as e:
+        con.rollback()
+        print("❌ insert failed:", e)
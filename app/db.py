@@ -49,6 +49,10 @@ def run_startup_migrations() -> None:
         ("sp_tenant_carrier",                 "ALTER TABLE tenant ADD COLUMN IF NOT EXISTS carrier TEXT"),
         ("sp_tenant_carrier_setup_complete",  "ALTER TABLE tenant ADD COLUMN IF NOT EXISTS carrier_setup_complete BOOLEAN DEFAULT FALSE"),
         ("sp_tenant_torevez_dialable_number", "ALTER TABLE tenant ADD COLUMN IF NOT EXISTS torevez_dialable_number TEXT"),
+        # Latest-lead-per-phone lookups (lead throttle) — index scan + LIMIT 1 instead of scan+sort
+        ("sp_ix_lead_tenant_phone_created", "CREATE INDEX IF NOT EXISTS ix_lead_tenant_phone_created ON lead (tenant_id, phone, created_at DESC)"),
+        # Reminder dedupe (_already_sent) — one index probe per reminder instead of a per-tenant scan
+        ("sp_ix_remindersent_dedupe", "CREATE INDEX IF NOT EXISTS ix_remindersent_dedupe ON remindersent (tenant_id, phone, template, booking_start)"),
     ]
     with Session(engine) as session:
         for sp, ddl in migrations:
@@ -71,7 +71,7 @@ async def get_tenant_id(
         return str(tenant_key)
 
     # 4) Direct Bearer JWT (for cases where middleware is bypassed)
-    if authorization and authorization.lower().startswith("bearer "):
+    if authorization and authorization[:7].lower() == "bearer ":
         token = authorization.split(" ", 1)[1].strip()
         try:
             info = parse_token(token)
@@ -1,7 +1,11 @@
 # app/logging_config.py
+import atexit
 import logging
 import logging.config
+import logging.handlers
+import queue
 from pathlib import Path
+from typing import Optional
 
 # Ensure logs/ folder exists
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -86,7 +90,42 @@ LOGGING_CONFIG = {
 }
 
 
+_queue_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def _move_app_handlers_to_queue() -> None:
+    """
+    Request-path code logs under "app.*". Hand those records to a
+    QueueListener thread so console/file I/O never blocks the event loop.
+    """
+    global _queue_listener
+    app_logger = logging.getLogger("app")
+    handlers = list(app_logger.handlers)
+    if not handlers:
+        return
+    _stop_queue_listener()
+
+    q: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    for h in handlers:
+        app_logger.removeHandler(h)
+    app_logger.addHandler(logging.handlers.QueueHandler(q))
+
+    _queue_listener = logging.handlers.QueueListener(q, *handlers, respect_handler_level=True)
+    _queue_listener.start()
+
+
+def _stop_queue_listener() -> None:
+    global _queue_listener
+    if _queue_listener is not None:
+        _queue_listener.stop()
+        _queue_listener = None
+
+
+atexit.register(_stop_queue_listener)
+
+
 def setup_logging() -> None:
     logging.config.dictConfig(LOGGING_CONFIG)
+    _move_app_handlers_to_queue()
     logging.getLogger("app").info("✅ Logging initialized")
 
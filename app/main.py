@@ -4,6 +4,7 @@ from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.routing import APIRoute
 from fastapi.staticfiles import StaticFiles
+from starlette.background import BackgroundTask
 from app.routers import public
 from collections import defaultdict
 from typing import Optional
@@ -53,6 +54,7 @@ from app.routers.admin_tenant_mgmt import router as admin_tenant_mgmt_router
 from app.routers.admin_usage import router as admin_usage_router
 from app.routers.onboarding import router as onboarding_router
 from app.routers import cron
+from app.utils.responses import ORJSONResponse
 
 def gen_op_id(route: APIRoute):
     method = next(iter(route.methods)).lower() if route.methods else "get"
@@ -64,6 +66,7 @@ app = FastAPI(
     title="HVAC SaaS Bot (MVP)",
     version="0.1.0",
     generate_unique_id_function=gen_op_id,
+    default_response_class=ORJSONResponse,
 )
 
 # ---------- CORS ----------
@@ -104,20 +107,30 @@ async def global_exception_handler(request: Request, exc: Exception):
     """
     logging.error("🔥 UNHANDLED SERVER ERROR", exc_info=exc)
 
+    # Alert SMS goes out after the 500 is sent (threadpool), not on the event loop
+    background = None
     try:
         path = request.url.path
         subject = f"{type(exc).__name__} on {path}"
         details = str(exc)[:500]
-        alert_error(subject, details)
+        background = BackgroundTask(_send_error_alert, subject, details)
     except Exception as alert_err:
-        logging.error("Failed to send alert SMS", exc_info=alert_err)
+        logging.error("Failed to queue alert SMS", exc_info=alert_err)
 
     return JSONResponse(
         status_code=500,
         content={"detail": "Internal server error"},
+        background=background,
     )
 
 
+def _send_error_alert(subject: str, details: str) -> None:
+    try:
+        alert_error(subject, details)
+    except Exception as alert_err:
+        logging.error("Failed to send alert SMS", exc_info=alert_err)
+
+
 # ---------- helpers ----------
 def _tenant_keys():
     if hasattr(config, "TENANT_KEYS") and isinstance(getattr(config, "TENANT_KEYS"), dict):
@@ -231,7 +244,7 @@ async def tenant_middleware(request: Request, call_next):
 
     # --- 1) Bearer token ---
     auth_header = (request.headers.get("authorization") or "").strip()
-    if auth_header.lower().startswith("bearer "):
+    if auth_header[:7].lower() == "bearer ":
         raw_token = auth_header[7:].strip()
         try:
             payload = parse_token(raw_token)
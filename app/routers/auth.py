@@ -175,7 +175,7 @@ def get_current_user(
     """
     Reads Authorization: Bearer <token>, decodes JWT, returns { email, tenant_slug }.
     """
-    if not authorization.lower().startswith("bearer "):
+    if authorization[:7].lower() != "bearer ":
         raise HTTPException(status_code=401, detail="Not authenticated")
 
     token = authorization.split(" ", 1)[1].strip()
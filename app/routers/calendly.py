@@ -7,6 +7,7 @@ from pydantic import BaseModel
 from typing import Dict, Any, Optional
 from datetime import timedelta
 import hashlib
+import hmac
 from app.tenantold import brand
 from app import config, storage
 from app.db import get_session
@@ -69,7 +70,7 @@ def calendly_webhook(
     secret_expected = getattr(config, "CALENDLY_WEBHOOK_SECRET", "") or ""
     if secret_expected:
         secret_got = (request.headers.get("x-webhook-secret") or "").strip()
-        if secret_got != secret_expected:
+        if not hmac.compare_digest(secret_got.encode(), secret_expected.encode()):
             raise HTTPException(status_code=401, detail="Invalid Calendly secret")
 
     # Calendly sometimes nests under "payload"
@@ -12,6 +12,7 @@ from zoneinfo import ZoneInfo
 from app.services.sms import (
     booking_confirmation_sms,
     booking_reminder_sms,
+    booking_reminder_sms_batch,
     send_sms,
     booking_office_notify_sms,
     get_brand_for_tenant,   # 👈 add this
@@ -49,7 +50,7 @@ def _parse_resched_token(token_b64: str) -> tuple[int, str]:
         raw = base64.urlsafe_b64decode(token_b64 + "==").decode()
         booking_id_str, tenant, exp_str, sig = raw.split(".")
         payload = f"{booking_id_str}.{tenant}.{exp_str}"
-        if _sign(payload, _hmac_secret()) != sig:
+        if not hmac.compare_digest(_sign(payload, _hmac_secret()).encode(), sig.encode()):
             raise ValueError("bad-signature")
         if int(exp_str) < int(time.time()):
             raise ValueError("expired")
@@ -596,8 +597,8 @@ def run_email_reminders():
                     (target_dt.isoformat(), tolerance_min, kind),
                 ).mappings().all()
 
-                for r in rows:
-                    payload = {
+                payloads = [
+                    {
                         "name": r["name"],
                         "email": r["email"],
                         "phone": r["phone"],
@@ -605,10 +606,22 @@ def run_email_reminders():
                         "service": r["service"],
                         "starts_at_iso": r["starts_at"],
                     }
-
-                    # send email + SMS; count as "sent" if either succeeds
+                    for r in rows
+                ]
+
+                # SMS go out per tenant in one concurrent batch (one brand lookup each)
+                by_tenant: dict = {}
+                for i, r in enumerate(rows):
+                    by_tenant.setdefault(r["tenant_key"], []).append(i)
+                sms_results = [False] * len(rows)
+                for tenant_key, idxs in by_tenant.items():
+                    oks = booking_reminder_sms_batch(tenant_key, [payloads[i] for i in idxs], kind)
+                    for i, ok in zip(idxs, oks):
+                        sms_results[i] = ok
+
+                for r, payload, sms_ok in zip(rows, payloads, sms_results):
+                    # email + SMS; count as "sent" if either succeeds
                     email_ok = send_booking_reminder(r["tenant_key"], payload, kind)
-                    sms_ok = booking_reminder_sms(r["tenant_key"], payload, kind)
 
                     if email_ok or sms_ok:
                         conn.exec_driver_sql(
@@ -2,6 +2,7 @@
 from datetime import datetime, timedelta, timezone
 from typing import Dict, Any, List, Optional, Tuple
 from zoneinfo import ZoneInfo
+from sqlalchemy import DateTime, literal, or_
 from sqlmodel import Session, select
 from fastapi import APIRouter, Depends, Query, Request, HTTPException
 
@@ -27,6 +28,10 @@ def _tenant_keys_map() -> dict:
     return {}
 
 
+# token -> tenant_id, snapshotted once (config is read at import anyway)
+_TENANT_KEYS = dict(_tenant_keys_map())
+
+
 def _resolve_tenant(request: Request) -> Optional[str]:
     """
     Resolve tenant in priority:
@@ -40,14 +45,15 @@ def _resolve_tenant(request: Request) -> Optional[str]:
 
     api_key = (request.headers.get("x-api-key") or "").strip()
     if api_key:
-        t = _tenant_keys_map().get(api_key)
+        t = _TENANT_KEYS.get(api_key)
         if t:
             return t
 
     auth = (request.headers.get("authorization") or "")
-    if auth.lower().startswith("bearer "):
+    # only the 7-char prefix is case-folded, not the whole header
+    if auth[:7].lower() == "bearer ":
         token = auth[7:].strip()
-        t = _tenant_keys_map().get(token)
+        t = _TENANT_KEYS.get(token)
         if t:
             return t
 
@@ -78,6 +84,20 @@ def _parse_reminder_list() -> List[Tuple[str, timedelta]]:
             except Exception:
                 continue
     return out or [("24h", timedelta(hours=24)), ("2h", timedelta(hours=2))]
+
+
+def _reminder_window_pad() -> timedelta:
+    pad_src = getattr(config, "REMINDER_WINDOW_SECONDS", None)
+    if pad_src is None and hasattr(config, "settings"):
+        pad_src = getattr(config.settings, "REMINDER_WINDOW_SECONDS", 900)
+    return timedelta(seconds=int(pad_src or 900))  # default 15m
+
+
+# Config is fixed for the life of the process — resolve once, not per sweep/booking.
+_REMINDER_TEMPLATES: Tuple[Tuple[str, timedelta], ...] = tuple(_parse_reminder_list())
+_WINDOW_PAD = _reminder_window_pad()
+_FROM_NAME = config.FROM_NAME
+_BOOKING_LINK = getattr(config, "BOOKING_LINK", "") or ""
 def _utc_naive(dt: datetime) -> datetime:
     if not dt:
         return dt
@@ -86,8 +106,13 @@ def _utc_naive(dt: datetime) -> datetime:
     return dt.astimezone(timezone.utc).replace(tzinfo=None, microsecond=0)
 
 
+def _utc_naive_param(dt: datetime):
+    """_utc_naive(dt) bound as a plain (naive) DateTime, bypassing the model's aware-only column type."""
+    return literal(_utc_naive(dt), DateTime())
+
+
 def _already_sent(session: Session, tenant_id: str, phone: str, template: str, booking_start: datetime) -> bool:
-    bs = _utc_naive(booking_start)
+    bs = _utc_naive_param(booking_start)
     q = select(ReminderModel).where(
         (ReminderModel.tenant_id == tenant_id) &
         (ReminderModel.phone == phone) &
@@ -107,8 +132,8 @@ def _make_msg(name: str, start_dt_utc: datetime, tenant_tz: ZoneInfo) -> str:
         local = start_dt_utc
     when = local.strftime("%a %b %d at %I:%M %p").lstrip("0")
     return (
-        f"Reminder from {config.FROM_NAME}: your appointment is {when} ({tz_name}). "
-        f"Need to reschedule? {config.BOOKING_LINK}"
+        f"Reminder from {_FROM_NAME}: your appointment is {when} ({tz_name}). "
+        f"Need to reschedule? {_BOOKING_LINK}"
     )
 
 
@@ -121,24 +146,37 @@ def _iter_due(session: Session, tenant_id: str, window_minutes: int) -> List[Dic
     window_start = now - timedelta(minutes=max(1, window_minutes))
     window_end = now
 
-    pad_src = getattr(config, "REMINDER_WINDOW_SECONDS", None)
-    if pad_src is None and hasattr(config, "settings"):
-        pad_src = getattr(config.settings, "REMINDER_WINDOW_SECONDS", 900)
-    window_pad = int(pad_src or 900)  # default 15m
+    due: List[Dict[str, Any]] = []
 
-    since = now - timedelta(days=2)
-    until = now + timedelta(days=7)
+    # trigger = start - delta must land in [lo, hi]  <=>  start in [lo + delta, hi + delta],
+    # so compute each template's start-time bounds once instead of per booking.
+    lo = window_start - _WINDOW_PAD
+    hi = window_end + _WINDOW_PAD
+    start_bounds = [(tpl_name, lo + delta, hi + delta) for tpl_name, delta in _REMINDER_TEMPLATES]
+
+    # Only load bookings that fall in some template's window (and have a phone
+    # to text) — one range per template, still clamped to the old -2d/+7d horizon.
+    horizon_lo = now - timedelta(days=2)
+    horizon_hi = now + timedelta(days=7)
+    # booking.start is a naive UTC column; bind naive UTC bounds so the DB
+    # session TimeZone can't shift these narrow windows (same as _already_sent).
+    ranges = [
+        BookingModel.start.between(
+            _utc_naive_param(max(start_lo, horizon_lo)), _utc_naive_param(min(start_hi, horizon_hi))
+        )
+        for _, start_lo, start_hi in start_bounds
+        if start_lo <= horizon_hi and start_hi >= horizon_lo
+    ]
+    if not ranges:
+        return due
     rows = session.exec(
         select(BookingModel)
         .where(BookingModel.tenant_id == tenant_id)
-        .where(BookingModel.start >= since)
-        .where(BookingModel.start <= until)
+        .where(or_(*ranges))
+        .where(BookingModel.phone != "")
         .order_by(BookingModel.start.asc())
     ).all()
 
-    templates = _parse_reminder_list()
-    due: List[Dict[str, Any]] = []
-
     tenant_tz = get_tenant_tz(tenant_id, session)
 
     for r in rows:
@@ -153,26 +191,34 @@ def _iter_due(session: Session, tenant_id: str, window_minutes: int) -> List[Dic
             # stored as naive local time → attach config.TZ, then convert to UTC
             start_dt_utc = r.start.replace(tzinfo=timezone.utc)
 
-        name = r.name or ""
+        # Range-check first; phone normalization and the message body are only
+        # built for bookings that are actually due for some template.
+        matched = [tpl_name for tpl_name, start_lo, start_hi in start_bounds if start_lo <= start_dt_utc <= start_hi]
+        if not matched:
+            continue
+
         phone_raw = (r.phone or "").strip()
         e164 = normalize_us_phone(phone_raw) if phone_raw else ""
+        if not e164:
+            continue
 
-        for tpl_name, delta in templates:
-            trigger = start_dt_utc - delta
-            if (window_start - timedelta(seconds=window_pad)) <= trigger <= (window_end + timedelta(seconds=window_pad)):
-                if e164 and not _already_sent(session, tenant_id, e164, tpl_name, start_dt_utc.replace(microsecond=0)):
+        name = r.name or ""
+        body = None
+        for tpl_name in matched:
+            if not _already_sent(session, tenant_id, e164, tpl_name, start_dt_utc.replace(microsecond=0)):
+                if body is None:
                     body = _make_msg(name, start_dt_utc, tenant_tz)
-                    due.append({
-                        "tenant_id": tenant_id,
-                        "phone": e164,
-                        "name": name,
-                        "email": (r.email or None),
-                        "booking_start": start_dt_utc,
-                        "booking_end": r.end,
-                        "template": tpl_name,
-                        "message": body,
-                        "source": r.source or "cron",
-                    })
+                due.append({
+                    "tenant_id": tenant_id,
+                    "phone": e164,
+                    "name": name,
+                    "email": (r.email or None),
+                    "booking_start": start_dt_utc,
+                    "booking_end": r.end,
+                    "template": tpl_name,
+                    "message": body,
+                    "source": r.source or "cron",
+                })
 
     return due
 
@@ -244,6 +290,11 @@ def _send_for_tenant(session: Session, tenant_id: str, look_back_minutes: int) -
     Core send+log logic for a single tenant. Reused by both per-tenant and all-tenants endpoints.
     """
     items = _iter_due(session, tenant_id, look_back_minutes)
+    if not items:
+        return {"sent": 0, "skipped_duplicates": 0, "failures": 0}
+
+    # Tenant tz is constant for the sweep — resolve once, not per reminder
+    tenant_tz = get_tenant_tz(tenant_id, session)
 
     sent = 0
     skipped_duplicates = 0
@@ -272,7 +323,7 @@ def _send_for_tenant(session: Session, tenant_id: str, look_back_minutes: int) -
         # EMAIL reminder (24h / 2h) – parallel to SMS
         email_ok = False
         try:
-            start_dt_local = start_dt.astimezone(get_tenant_tz(tenant_id, session))
+            start_dt_local = start_dt.astimezone(tenant_tz)
             email_payload = {
                 "name": name,
                 "email": it.get("email") or None,
@@ -280,7 +331,7 @@ def _send_for_tenant(session: Session, tenant_id: str, look_back_minutes: int) -
                 "address": "",
                 "service": "appointment",
                 "starts_at_iso": start_dt_local.isoformat(),
-                "reschedule_url": getattr(config, "BOOKING_LINK", "") or "",
+                "reschedule_url": _BOOKING_LINK,
             }
             email_ok = send_booking_reminder(tenant_id, email_payload, template)
         except Exception as e:
@@ -1,43 +1,60 @@
 # app/routers/reviews.py
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional
 
 from fastapi import APIRouter, Depends, Query, Request
 from sqlmodel import Session, select
-from datetime import datetime, timedelta, timezone
+from sqlalchemy import insert as sa_insert
+from datetime import datetime, timezone
 
 from app import config, storage
-from app.services.sms import send_sms
+from app.services.sms import send_sms, is_blocked_number
 from app.services.email import send_email
 from app.db import get_session
 from app.models import Review as ReviewModel
 from app.utils.phone import normalize_us_phone
 from app.deps import get_tenant_id  # ✅ tenant resolver
 from app.tenantold import brand
+from app.utils.responses import ORJSONResponse
 
 router = APIRouter(prefix="", tags=["reviews"])
 
 
+# Config is fixed for the life of the process — resolve once at import.
+_ANTI_SPAM_MINUTES = int(getattr(config, "ANTI_SPAM_MINUTES", 120))
+_DB_FIRST = getattr(config, "DB_FIRST", True)
+
+# Review emails run here so they overlap the (blocking) Twilio SMS call.
+_NOTIFY_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="review-email")
+
+
 # ----------------------- helpers -----------------------
 
 def _blocked_number(phone: str) -> bool:
-    bl = (getattr(config, "SMS_BLOCKLIST", "") or "").split(",")
-    return phone in [x.strip() for x in bl if x.strip()]
+    return is_blocked_number(phone)
+
 
+def _brand_or_empty(tenant_id: str, session: Optional[Session] = None) -> Dict[str, Any]:
+    try:
+        return brand(tenant_id, db=session)
+    except Exception:
+        return {}
 
-def _review_link_for_tenant(tenant_id: str, session: Session) -> str:
+
+def _review_link_for_tenant(tenant_id: str, session: Session, b: Optional[Dict[str, Any]] = None) -> str:
     """
     Prefer per-tenant REVIEW_GOOGLE_URL via brand(…, db=session).
     Fallbacks:
       - config.GOOGLE_REVIEW_LINK (legacy)
       - brand(..., db=session)['BOOKING_LINK'] (last resort)
+    Pass `b` when the caller already has the brand dict.
     """
-    try:
-        b = brand(tenant_id, db=session)
-        link = (b.get("REVIEW_GOOGLE_URL") or "").strip()
-        if link:
-            return link
-    except Exception:
-        pass
+    if b is None:
+        b = _brand_or_empty(tenant_id, session)
+
+    link = (b.get("REVIEW_GOOGLE_URL") or "").strip()
+    if link:
+        return link
 
     # legacy global fallback
     link = (getattr(config, "GOOGLE_REVIEW_LINK", "") or "").strip()
@@ -45,19 +62,25 @@ def _review_link_for_tenant(tenant_id: str, session: Session) -> str:
         return link
 
     # last resort: booking link
-    try:
-        b = brand(tenant_id, db=session)
-        return (b.get("BOOKING_LINK") or "").strip()
-    except Exception:
-        return ""
+    return (b.get("BOOKING_LINK") or "").strip()
 
 
-def _from_name_for_tenant(tenant_id: str) -> str:
+def _send_review_email(email: str, from_name: str, name: str, msg: str) -> bool:
     try:
-        b = brand(tenant_id)
-        return b.get("FROM_NAME") or getattr(config, "FROM_NAME", "Our Team")
-    except Exception:
-        return getattr(config, "FROM_NAME", "Our Team")
+        sub = f"Thanks from {from_name} — quick review?"
+        hi_name = name if name != "there" else ""
+        txt = f"Hi {hi_name},\n\n{msg}\n"
+        html = f"<p>Hi {hi_name},</p><p>{msg}</p>"
+        return send_email(email, sub, txt, html)
+    except Exception as e:
+        print(f"[REVIEW EMAIL ERROR] {e}")
+        return False
+
+
+def _from_name_for_tenant(tenant_id: str, b: Optional[Dict[str, Any]] = None) -> str:
+    if b is None:
+        b = _brand_or_empty(tenant_id)
+    return b.get("FROM_NAME") or getattr(config, "FROM_NAME", "Our Team")
 
 
 # ------------------------- routes -------------------------
@@ -74,8 +97,9 @@ def mark_job_complete(
     Body: { phone, name?, job_id?, notes?, email?, message? }
 
     - Normalizes phone
-    - Throttles via storage.sent_recently (ANTI_SPAM_MINUTES)
     - Honors SMS_BLOCKLIST
+    - Throttles via storage.sent_recently (ANTI_SPAM_MINUTES)
+    - Resolves branding + renders the body only when SMS/email will go out
     - Sends SMS + optional email copy
     - DB-first to Review table; CSV only if DB_FIRST=false
     - Stamps tenant_id
@@ -86,40 +110,47 @@ def mark_job_complete(
     job_id = (payload.get("job_id") or "").strip() or None
     notes = (payload.get("notes") or "").strip() or None
 
-    # per-tenant review link + from name
-    review_link = _review_link_for_tenant(tenant_id, session)
-    from_name = _from_name_for_tenant(tenant_id)
-
-    # Allow custom message override
-    msg = (payload.get("message") or
-           f"Thanks {name} for choosing {from_name}! If we did a great job, would you leave a review? {review_link}").strip()
-
-    # SMS
-    sms_ok = False
+    # Cheap gates first (blocklist → throttle) so blocked/throttled numbers
+    # skip the branding lookup and body render entirely.
+    sms_allowed = False
     if phone and not _blocked_number(phone):
-        minutes = int(getattr(config, "ANTI_SPAM_MINUTES", 120))
+        minutes = _ANTI_SPAM_MINUTES
         try:
-            if not storage.sent_recently(phone, minutes=minutes):
-                sms_ok = send_sms(phone, msg)
-            else:
+            sms_allowed = not storage.sent_recently(phone, minutes=minutes)
+            if not sms_allowed:
                 print(f"[REVIEWS] Throttled SMS to {phone} ({minutes}m)")
         except Exception as e:
             print(f"[REVIEW SMS ERROR] {e}")
 
-    # Email (optional)
-    email_ok = False
-    if email:
+    # per-tenant review link + from name (only if something will be sent)
+    review_link = ""
+    from_name = ""
+    msg = ""
+    if sms_allowed or email:
+        b = _brand_or_empty(tenant_id, session)  # one lookup for both fields
+        review_link = _review_link_for_tenant(tenant_id, session, b)
+        from_name = _from_name_for_tenant(tenant_id, b)
+
+        # Allow custom message override
+        msg = (payload.get("message") or
+               f"Thanks {name} for choosing {from_name}! If we did a great job, would you leave a review? {review_link}").strip()
+
+    # Email (optional) goes out on the pool while SMS sends here, so the
+    # request waits for max(sms, email) instead of their sum.
+    email_future = _NOTIFY_POOL.submit(_send_review_email, email, from_name, name, msg) if email else None
+
+    # SMS
+    sms_ok = False
+    if sms_allowed:
         try:
-            sub = f"Thanks from {from_name} — quick review?"
-            hi_name = name if name != "there" else ""
-            txt = f"Hi {hi_name},\n\n{msg}\n"
-            html = f"<p>Hi {hi_name},</p><p>{msg}</p>"
-            email_ok = send_email(email, sub, txt, html)
+            sms_ok = send_sms(phone, msg)
         except Exception as e:
-            print(f"[REVIEW EMAIL ERROR] {e}")
+            print(f"[REVIEW SMS ERROR] {e}")
+
+    email_ok = email_future.result() if email_future is not None else False
 
     # CSV write ONLY if DB_FIRST is false (kept for backup compatibility)
-    if not getattr(config, "DB_FIRST", True):
+    if not _DB_FIRST:
         try:
             storage.save_review(
                 {
@@ -147,9 +178,11 @@ def mark_job_complete(
                 source="api",
             )
 
-    # DB write (primary)
-    session.add(
-        ReviewModel(
+    # DB write (primary) — Core INSERT (no ORM unit-of-work), typed binds so
+    # created_at is stored in the same format as ORM-written rows
+    session.exec(
+        sa_insert(ReviewModel).values(
+            created_at=datetime.now(timezone.utc),
             phone=phone,
             name=name if name != "there" else "",
             job_id=job_id,
@@ -185,14 +218,7 @@ def debug_reviews(
         items = [
             {
                 "id": r.id,
-                "created_at": (
-    (r.created_at if r.created_at.tzinfo else r.created_at.replace(tzinfo=timezone.utc))
-    .astimezone(timezone.utc)
-    .isoformat(timespec="seconds")
-    .replace("+00:00", "Z")
-    if r.created_at else None
-),
-
+                "created_at": r.created_at,
                 "phone": r.phone,
                 "name": r.name,
                 "job_id": r.job_id,
@@ -203,7 +229,8 @@ def debug_reviews(
             }
             for r in rows
         ]
-        return {"count": len(items), "items": items}
+        # created_at is rendered by orjson as UTC ISO with a trailing Z
+        return ORJSONResponse({"count": len(items), "items": items})
 
     # CSV
     items = storage.read_reviews(limit)
@@ -13,7 +13,7 @@ def sms_config(request: Request, tenant_id: str = Depends(get_tenant_id)):
         "account_sid_len": len(config.settings.TWILIO_ACCOUNT_SID or ""),
         "messaging_service_sid_len": len(config.settings.TWILIO_MESSAGING_SERVICE_SID or ""),
         "from_number": config.settings.TWILIO_FROM or "",
-        "dry_run": is_dry_run(),  # <- live read each call
+        "dry_run": is_dry_run(),  # <- env re-read every few seconds
     }
 
 @router.post("/debug/sms-test")
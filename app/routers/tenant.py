@@ -1,7 +1,8 @@
 # app/routers/tenant.py
 import re
+from functools import lru_cache
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
 from fastapi import APIRouter, Depends, HTTPException
@@ -14,22 +15,28 @@ from app.db import get_session
 from app.deps import get_tenant_id
 from app.models import Tenant
 from app.services.review_link_resolver import resolve_and_save_google_review_link
+from app.services.sms import invalidate_brand
 
 router = APIRouter(prefix="/tenant", tags=["tenant"])
 
 _DEFAULT_TZ = "America/New_York"
 
 
+@lru_cache(maxsize=64)
+def _zone(tz_str: str) -> ZoneInfo:
+    return ZoneInfo(tz_str)
+
+
 def get_tenant_tz(tenant_id: str, session: Session) -> ZoneInfo:
     """Return the ZoneInfo for a tenant's configured timezone, defaulting to America/New_York."""
     try:
         t = session.exec(select(Tenant).where(Tenant.slug == tenant_id)).first()
         tz_str = (getattr(t, "timezone", None) or "").strip() if t else ""
         if tz_str:
-            return ZoneInfo(tz_str)
+            return _zone(tz_str)
     except (ZoneInfoNotFoundError, Exception):
         pass
-    return ZoneInfo(getattr(config, "TZ", _DEFAULT_TZ))
+    return _zone(getattr(config, "TZ", _DEFAULT_TZ))
 
 
 # ---------------- config helpers ----------------
@@ -88,14 +95,12 @@ def review_link(tenant_id: str, db: "Optional[object]" = None) -> Optional[str]:
     return None
 
 
-def brand(tenant_id: str, db: Optional[Session] = None) -> Dict[str, Any]:
+@lru_cache(maxsize=64)
+def _config_brand(tenant_id: str) -> Tuple[Any, Any, Optional[str], Any, Any]:
     """
-    Return branding with keys:
-      - FROM_NAME
-      - BOOKING_LINK
-      - REVIEW_GOOGLE_URL
-      - OFFICE_SMS_TO
-      - OFFICE_EMAIL_TO
+    Config-only branding for a tenant (TENANT_BRANDS overrides, then global config).
+    Resolved once per tenant; DB overrides are applied per call in brand().
+    Call _config_brand.cache_clear() if config is reloaded.
     """
     overrides = _tenant_overrides().get(tenant_id, {})
 
@@ -123,7 +128,7 @@ def brand(tenant_id: str, db: Optional[Session] = None) -> Dict[str, Any]:
     if isinstance(override_or_global_review, str) and override_or_global_review.strip():
         review_url = override_or_global_review.strip()
     else:
-        review_url = review_link(tenant_id, db=db)
+        review_url = None
 
     office_sms = (
         overrides.get("OFFICE_SMS_TO")
@@ -137,6 +142,22 @@ def brand(tenant_id: str, db: Optional[Session] = None) -> Dict[str, Any]:
         or getattr(getattr(config, "settings", object()), "OFFICE_EMAIL_TO", None)
     )
 
+    return FROM_NAME, BOOKING_LINK, review_url, office_sms, office_email
+
+
+def brand(tenant_id: str, db: Optional[Session] = None) -> Dict[str, Any]:
+    """
+    Return branding with keys:
+      - FROM_NAME
+      - BOOKING_LINK
+      - REVIEW_GOOGLE_URL
+      - OFFICE_SMS_TO
+      - OFFICE_EMAIL_TO
+    """
+    FROM_NAME, BOOKING_LINK, review_url, office_sms, office_email = _config_brand(tenant_id)
+    if review_url is None:
+        review_url = review_link(tenant_id, db=db)
+
     if db is not None:
         try:
             t = db.exec(select(Tenant).where(Tenant.slug == tenant_id)).first()
@@ -204,6 +225,7 @@ class ProfileIn(BaseModel):
 
 class AutoResolveIn(BaseModel):
     tenant_slug: str
+    force_refresh: bool = False  # re-run the Places lookup even if a link is saved
 
 
 # ---------------- routes ----------------
@@ -221,6 +243,7 @@ def set_place_id(body: PlaceIdIn, db: Session = Depends(get_session)):
     )
     db.add(t)
     db.commit()
+    invalidate_brand(t.slug)
     db.refresh(t)
 
     return {
@@ -240,6 +263,7 @@ def set_review_url(body: ReviewUrlIn, db: Session = Depends(get_session)):
     t.review_google_url = body.review_google_url.strip()
     db.add(t)
     db.commit()
+    invalidate_brand(t.slug)
     db.refresh(t)
 
     return {
@@ -259,6 +283,7 @@ def set_profile(data: ProfileIn, db: Session = Depends(get_session)):
     t.address = (data.address or "").strip()
     db.add(t)
     db.commit()
+    invalidate_brand(t.slug)
     db.refresh(t)
     return {
         "ok": True,
@@ -271,7 +296,7 @@ def set_profile(data: ProfileIn, db: Session = Depends(get_session)):
 
 @router.post("/settings/reviews/auto")
 def auto_resolve_review_link(body: AutoResolveIn, db: Session = Depends(get_session)):
-    res = resolve_and_save_google_review_link(db, body.tenant_slug)
+    res = resolve_and_save_google_review_link(db, body.tenant_slug, force_refresh=body.force_refresh)
     if not res.get("ok"):
         raise HTTPException(status_code=400, detail=res.get("error", "resolve_failed"))
     return res
@@ -304,6 +329,7 @@ def update_tenant_settings(
 
     db.add(t)
     db.commit()
+    invalidate_brand(t.slug)
     db.refresh(t)
 
     return {"ok": True, "tenant": t.slug, "updated": data}
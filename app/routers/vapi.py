@@ -4,14 +4,14 @@ import os
 import re
 from fastapi import APIRouter, BackgroundTasks, Depends, Request
 from pydantic import BaseModel
-from sqlalchemy.exc import IntegrityError
 from sqlmodel import Session, select
 from datetime import date, datetime, timedelta
 from typing import Any, Optional
 
 from app.call_cache import lookup as cache_lookup, evict as cache_evict
 from app.db import get_session
-from app.models import Lead as LeadModel, Tenant, WebhookDedup
+from app.models import Lead as LeadModel, Tenant
+from app.services.dedupe import dedupe_insert
 from app.services.sms import vapi_lead_office_sms
 
 router = APIRouter(prefix="", tags=["vapi"])
@@ -1382,20 +1382,16 @@ def _resolve_tenant(phone_number_id: Optional[str], session: Session) -> Optiona
     return None
 
 
-def _dedupe_insert(session: Session, source: str, event_id: str) -> bool:
+def _send_office_sms(tenant_id: str, payload: dict) -> None:
     try:
-        session.rollback()
-        session.add(WebhookDedup(source=source, event_id=event_id))
-        session.commit()
-        return True
-    except IntegrityError:
-        session.rollback()
-        return False
+        vapi_lead_office_sms(tenant_id, payload)
+        print(
+            f"[VAPI] office SMS sent for tenant={tenant_id!r} partial={payload.get('partial')} "
+            f"needs_verification={payload.get('needs_verification')}",
+            flush=True,
+        )
     except Exception as e:
-        session.rollback()
-        print(f"[VAPI] dedupe insert error: {e}", flush=True)
-        return False
-
+        print(f"[VAPI] office SMS error: {e}", flush=True)
 
 
 async def _handle_tool_call(body: dict, background_tasks: BackgroundTasks):
@@ -1476,7 +1472,7 @@ async def vapi_intake(
         )
         return {"status": "error", "detail": "tenant not resolved"}
 
-    if payload.call_id and not _dedupe_insert(session, source=f"vapi_intake:{tenant_id}", event_id=payload.call_id):
+    if payload.call_id and not dedupe_insert(session, source=f"vapi_intake:{tenant_id}", event_id=payload.call_id, log_prefix="VAPI"):
         print(f"[VAPI] duplicate intake ignored for tenant={tenant_id!r} call_id={payload.call_id!r}", flush=True)
         return {"status": "ok", "tenant_id": tenant_id, "deduped": True}
 
@@ -1528,22 +1524,19 @@ async def vapi_intake(
         session.rollback()
         print(f"[VAPI] lead insert error: {e}", flush=True)
 
-    try:
-        vapi_lead_office_sms(tenant_id, {
-            "name": name,
-            "phone": phone,
-            "email": email,
-            "issue": issue,
-            "zip": zip_code,
-            "service_address": service_address,
-            "service_urgency": service_urgency,
-            "customer_type": customer_type,
-            "property_type": property_type,
-            "partial": is_partial,
-            "needs_verification": needs_verification,
-        })
-        print(f"[VAPI] office SMS sent for tenant={tenant_id!r} partial={is_partial} needs_verification={needs_verification}", flush=True)
-    except Exception as e:
-        print(f"[VAPI] office SMS error: {e}", flush=True)
+    # Office SMS (brand lookup + Twilio call) runs after the response is sent
+    background_tasks.add_task(_send_office_sms, tenant_id, {
+        "name": name,
+        "phone": phone,
+        "email": email,
+        "issue": issue,
+        "zip": zip_code,
+        "service_address": service_address,
+        "service_urgency": service_urgency,
+        "customer_type": customer_type,
+        "property_type": property_type,
+        "partial": is_partial,
+        "needs_verification": needs_verification,
+    })
 
     return {"status": "ok", "tenant_id": tenant_id}
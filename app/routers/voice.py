@@ -1,14 +1,18 @@
 # app/routers/voice.py
+import logging
 import os
+import time
 import urllib.parse
 from app.call_cache import store as cache_store, lookup as cache_lookup
 from fastapi import APIRouter, Request, BackgroundTasks, Depends, HTTPException, status
 from fastapi.responses import Response, PlainTextResponse
+from starlette.concurrency import run_in_threadpool
 from sqlmodel import Session, select
-from sqlalchemy.exc import IntegrityError
-from twilio.request_validator import RequestValidator
+from twilio.request_validator import RequestValidator, add_port, remove_port
 from twilio.twiml.voice_response import VoiceResponse
 import hashlib
+import hmac
+from functools import lru_cache
 from typing import Optional
 from datetime import datetime, timezone
 from sqlmodel import SQLModel, Field, Column, DateTime, text
@@ -16,11 +20,14 @@ from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
 from app import config, storage
 from app.db import get_session
-from app.services.sms import send_sms, get_brand_for_tenant, _office_destination_for_tenant
-from app.models import WebhookDedup, Lead as LeadModel, Tenant, TenantSettings
-from app.utils.phone import normalize_us_phone
+from app.services.sms import send_sms, get_brand_for_tenant, _office_destination_for_tenant, is_blocked_number
+from app.models import Lead as LeadModel, Tenant, TenantSettings
+from app.services.dedupe import dedupe_insert
+from app.utils.phone import try_normalize_us_phone
 from ..deps import get_tenant_id as _get_tenant_id_strict
 
+log = logging.getLogger(__name__)
+
 
 async def get_tenant_id_public(
     request: Request,
@@ -53,7 +60,7 @@ async def get_tenant_id_public(
         return str(keys[api_key])
 
     auth = (request.headers.get("authorization") or "")
-    if auth.lower().startswith("bearer "):
+    if auth[:7].lower() == "bearer ":
         token = auth[7:].strip()
         if token in keys:
             return str(keys[token])
@@ -63,40 +70,40 @@ async def get_tenant_id_public(
         return tenant_q
 
     try:
-        form = await request.form()
+        form = await _cached_form(request)
 
         # Call-forwarding path: ForwardedFrom is the owner's real number the customer originally dialed
         forwarded_raw = (form.get("ForwardedFrom") or "").strip()
         if forwarded_raw:
-            forwarded_norm = normalize_us_phone(forwarded_raw) or forwarded_raw
+            forwarded_norm = try_normalize_us_phone(forwarded_raw) or forwarded_raw
             settings_rows = session.exec(
                 select(TenantSettings).where(TenantSettings.business_phone != None, TenantSettings.business_phone != "")
             ).all()
             for s in settings_rows:
-                if normalize_us_phone(s.business_phone or "") == forwarded_norm:
-                    print(f"[VOICE] tenant resolved via ForwardedFrom={forwarded_raw} → {s.tenant_id}", flush=True)
+                if try_normalize_us_phone(s.business_phone) == forwarded_norm:
+                    log.info("[VOICE] tenant resolved via ForwardedFrom=%s → %s", forwarded_raw, s.tenant_id)
                     return s.tenant_id
 
         # Direct-call path: To is the Twilio number
         to_raw = (form.get("To") or "").strip()
         if to_raw:
-            to_norm = normalize_us_phone(to_raw) or to_raw
+            to_norm = try_normalize_us_phone(to_raw) or to_raw
             settings_rows = session.exec(
                 select(TenantSettings).where(TenantSettings.twilio_number != None, TenantSettings.twilio_number != "")
             ).all()
             for s in settings_rows:
-                if normalize_us_phone(s.twilio_number or "") == to_norm:
+                if try_normalize_us_phone(s.twilio_number) == to_norm:
                     return s.tenant_id
             # Legacy: match against Tenant.phone
             tenants = session.exec(
                 select(Tenant).where(Tenant.phone != None, Tenant.phone != "")
             ).all()
             for t in tenants:
-                if normalize_us_phone(t.phone or "") == to_norm:
+                if try_normalize_us_phone(t.phone) == to_norm:
                     return t.slug
     except Exception as e:
         session.rollback()
-        print(f"[VOICE] tenant lookup error: {e}", flush=True)
+        log.warning("[VOICE] tenant lookup error: %s", e)
 
     return "default"
 
@@ -136,12 +143,26 @@ BUSINESS_OPEN_HOUR  = int(getattr(config, "BUSINESS_OPEN_HOUR", 9))
 BUSINESS_CLOSE_HOUR = int(getattr(config, "BUSINESS_CLOSE_HOUR", 17))
 BUSINESS_OPEN_DOWS  = set(map(int, (getattr(config, "BUSINESS_OPEN_DOWS", "0,1,2,3,4").split(","))))
 
+# (weekday, hour) pairs that count as open — built once instead of branching per call
+_OPEN_SLOTS = frozenset(
+    (dow, hour)
+    for dow in BUSINESS_OPEN_DOWS
+    for hour in range(BUSINESS_OPEN_HOUR, BUSINESS_CLOSE_HOUR)
+)
+
+# [epoch_minute, after_hours] — the answer can't change within a minute
+_AFTER_HOURS_MEMO = [-1, False]
+
 def _after_hours(now: datetime | None = None) -> bool:
-    now = now or datetime.now(timezone.utc)
+    if now is not None:
+        return (now.weekday(), now.hour) not in _OPEN_SLOTS
 
-    if now.weekday() not in BUSINESS_OPEN_DOWS:
-        return True
-    return not (BUSINESS_OPEN_HOUR <= now.hour < BUSINESS_CLOSE_HOUR)
+    minute = int(time.time() // 60)
+    if _AFTER_HOURS_MEMO[0] != minute:
+        local = datetime.now(BUSINESS_TZ)
+        _AFTER_HOURS_MEMO[1] = (local.weekday(), local.hour) not in _OPEN_SLOTS
+        _AFTER_HOURS_MEMO[0] = minute
+    return _AFTER_HOURS_MEMO[1]
 
 # allow X-Force-After-Hours only outside prod
 def _force_header_allowed() -> bool:
@@ -167,63 +188,107 @@ def _is_after_hours(request: Request) -> bool:
 
 # ----------------------- helpers -----------------------
 
+# token -> tenant_id, snapshotted once (config is read at import anyway)
+_TENANT_KEYS = dict(getattr(config, "TENANT_KEYS", {}) or {})
+
 def _tenant_from_headers(request: Request) -> str:
     auth = (request.headers.get("authorization") or "")
-    api_key = (request.headers.get("x-api-key") or "")
-    token = auth[7:].strip() if auth.lower().startswith("bearer ") else api_key.strip()
-    return getattr(config, "TENANT_KEYS", {}).get(token, "public")
+    # only the 7-char prefix is case-folded, not the whole header
+    if auth[:7].lower() == "bearer ":
+        token = auth[7:].strip()
+    else:
+        token = (request.headers.get("x-api-key") or "").strip()
+    return _TENANT_KEYS.get(token, "public")
+
+def _external_base(request: Request) -> str:
+    """
+    proto://host as Twilio saw it. Computed once per request and kept on
+    request.state so the signature check and TwiML callbacks share it.
+    """
+    base = getattr(request.state, "ext_base", None)
+    if base is None:
+        hdr = request.headers
+        # Render sets x-forwarded-proto but not x-forwarded-host; fall back to host header
+        proto = (hdr.get("x-forwarded-proto") or request.url.scheme or "https").split(",")[0].strip()
+        host = (hdr.get("host") or request.url.netloc).split(",")[0].strip()
+        base = f"{proto}://{host}"
+        request.state.ext_base = base
+    return base
 
 def _external_url_for_signature(request: Request) -> str:
-    hdr = request.headers
-    # Render sets x-forwarded-proto but not x-forwarded-host; fall back to host header
-    proto = (hdr.get("x-forwarded-proto") or request.url.scheme or "https").split(",")[0].strip()
-    host = (hdr.get("host") or request.url.netloc).split(",")[0].strip()
-    url = f"{proto}://{host}{request.url.path}"
+    url = _external_base(request) + request.url.path
     # Twilio signs the full URL including query string — must include it or sig fails
     qs = request.url.query
     if qs:
         url += f"?{qs}"
     return url
 
+@lru_cache(maxsize=1)
+def _validator(auth_token: str) -> RequestValidator:
+    return RequestValidator(auth_token)
+
+def _signature_matches(validator: RequestValidator, url: str, params, signature: str) -> bool:
+    """
+    Same check as RequestValidator.validate() for form posts, but the final
+    comparison goes through hmac.compare_digest. Twilio may sign the URL with
+    or without the default port, so both forms are accepted.
+    """
+    parsed = urllib.parse.urlparse(url)
+    expected = signature.encode("utf-8")
+    for candidate in (remove_port(parsed), add_port(parsed)):
+        computed = validator.compute_signature(candidate, params).encode("utf-8")
+        if hmac.compare_digest(computed, expected):
+            return True
+    return False
+
+async def _cached_form(request: Request):
+    """Parse the form once per request; tenant resolution, signature check and handler share it."""
+    form = getattr(request.state, "form_cache", None)
+    if form is None:
+        form = await request.form()
+        request.state.form_cache = form
+    return form
+
 async def _verify_twilio_signature(request: Request) -> bool:
     if not getattr(config, "TWILIO_VALIDATE_SIGNATURES", False):
         return True
     auth_token = (getattr(config, "TWILIO_AUTH_TOKEN", "") or "").strip()
     if not auth_token:
-        print("[VOICE] WARNING: TWILIO_AUTH_TOKEN not set — skipping signature validation", flush=True)
+        log.warning("[VOICE] TWILIO_AUTH_TOKEN not set — skipping signature validation")
         return True
     signature = request.headers.get("X-Twilio-Signature", "")
     if not signature:
-        print("[VOICE] WARNING: request missing X-Twilio-Signature header", flush=True)
+        log.warning("[VOICE] request missing X-Twilio-Signature header")
         return False
     url = _external_url_for_signature(request)
     params = {}
     ct = (request.headers.get("content-type") or "").lower()
     if ct.startswith("application/x-www-form-urlencoded") or ct.startswith("multipart/form-data"):
         try:
-            form = await request.form()
-            params = dict(form)
+            # FormData exposes getlist(), which the validator uses directly — no dict copy
+            params = await _cached_form(request)
         except Exception:
             params = {}
-    validator = RequestValidator(auth_token)
-    result = bool(validator.validate(url, params, signature))
+    # HMAC work runs in the threadpool so bursts of webhooks don't serialize on the loop
+    result = await run_in_threadpool(_signature_matches, _validator(auth_token), url, params, signature)
     if not result:
-        print(f"[VOICE] Twilio signature mismatch — url={url} sig={signature[:20]}...", flush=True)
+        log.warning("[VOICE] Twilio signature mismatch — url=%s sig=%.20s...", url, signature)
     return result
 
-def _dedupe_insert(session: Session, source: str, event_id: str) -> bool:
-    try:
-        session.rollback()  # clear any aborted transaction left by earlier errors
-        session.add(WebhookDedup(source=source, event_id=event_id))
-        session.commit()
-        return True
-    except IntegrityError:
-        session.rollback()
-        return False
-    except Exception as e:
-        session.rollback()
-        print(f"[DEDUPE] insert error: {e}", flush=True)
-        return False
+def _form_event_id(form) -> str:
+    """
+    Dedup key for webhooks without a CallSid: blake2b over "k=v&k=v..." in
+    sorted key order, fed incrementally so the joined string is never built.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    sep = b""
+    for k in sorted(form.keys()):
+        h.update(sep)
+        h.update(k.encode("utf-8"))
+        h.update(b"=")
+        h.update(str(form.get(k)).encode("utf-8"))
+        sep = b"&"
+    return h.hexdigest()
 
 def _log_lead_db(session: Session, phone: str, name: str, tenant_id: str, source: Optional[str] = None):
     if not phone:
@@ -240,11 +305,10 @@ def _log_lead_db(session: Session, phone: str, name: str, tenant_id: str, source
         session.commit()
     except Exception as e:
         session.rollback()
-        print(f"[VOICE] DB lead insert error: {e}")
+        log.error("[VOICE] DB lead insert error: %s", e)
 
 def _blocked_number(phone: str) -> bool:
-    bl = (getattr(config, "SMS_BLOCKLIST", "") or "").split(",")
-    return phone in [x.strip() for x in bl if x.strip()]
+    return is_blocked_number(phone)
 
 # ------------------------- routes -------------------------
 
@@ -259,20 +323,20 @@ async def twilio_voice(
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid Twilio signature")
 
     try:
-        form = await request.form()
+        form = await _cached_form(request)
     except Exception as e:
-        print(f"[VOICE] form parse error: {e}")
+        log.warning("[VOICE] form parse error: %s", e)
         form = {}
 
-    print(
-        f"[VOICE RAW] From={form.get('From')!r} To={form.get('To')!r} "
-        f"ForwardedFrom={form.get('ForwardedFrom')!r} Called={form.get('Called')!r} "
-        f"Direction={form.get('Direction')!r} full_form={dict(form)}",
-        flush=True,
-    )
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug(
+            "[VOICE RAW] From=%r To=%r ForwardedFrom=%r Called=%r Direction=%r full_form=%s",
+            form.get("From"), form.get("To"), form.get("ForwardedFrom"),
+            form.get("Called"), form.get("Direction"), dict(form),
+        )
 
     from_num_raw = (form.get("From") or "").strip()
-    from_num = normalize_us_phone(from_num_raw) or from_num_raw
+    from_num = try_normalize_us_phone(from_num_raw) or from_num_raw
     caller = (form.get("CallerName") or "").strip()
     call_sid = (form.get("CallSid") or "").strip()
     forwarded_from_raw = (form.get("ForwardedFrom") or "").strip()
@@ -280,19 +344,18 @@ async def twilio_voice(
     if call_sid:
         event_id = call_sid
     else:
-        pairs = "&".join(f"{k}={form.get(k)}" for k in sorted(form.keys()))
-        event_id = hashlib.sha256(pairs.encode("utf-8")).hexdigest()
+        event_id = _form_event_id(form)
 
-    first_time = _dedupe_insert(session, source=f"twilio_voice:{tenant_id}", event_id=event_id)
+    first_time = dedupe_insert(session, source=f"twilio_voice:{tenant_id}", event_id=event_id, log_prefix="VOICE")
 
     b = get_brand_for_tenant(tenant_id)
     business_name = b.get("business_name") or tenant_id
     booking_link = b.get("booking_link") or ""
-    print(f"[VOICE] brand lookup — tenant_id={tenant_id!r} business_name={business_name!r}", flush=True)
+    log.debug("[VOICE] brand lookup — tenant_id=%r business_name=%r", tenant_id, business_name)
 
     after_hours = _is_after_hours(request)
-    print(f"[VOICE] tenant={tenant_id} call_sid={call_sid or 'n/a'} first={first_time} "
-          f"from={from_num} forwarded_from={forwarded_from_raw!r} after_hours={after_hours}")
+    log.info("[VOICE] tenant=%s call_sid=%s first=%s from=%s forwarded_from=%r after_hours=%s",
+             tenant_id, call_sid or "n/a", first_time, from_num, forwarded_from_raw, after_hours)
 
     cache_store(call_sid, forwarded_from_raw)
 
@@ -311,14 +374,13 @@ async def twilio_voice(
     is_real_carrier_forward = bool(
         forwarded_from_raw
         and owner_phone
-        and normalize_us_phone(forwarded_from_raw) == normalize_us_phone(owner_phone)
+        and (try_normalize_us_phone(forwarded_from_raw) or forwarded_from_raw)
+        == (try_normalize_us_phone(owner_phone) or owner_phone)
     )
     if not is_real_carrier_forward:
         if owner_phone:
-            proto = (request.headers.get("x-forwarded-proto") or request.url.scheme or "https").split(",")[0].strip()
-            host = (request.headers.get("host") or request.url.netloc).split(",")[0].strip()
             action_url = (
-                f"{proto}://{host}/twilio/voice/no-answer"
+                f"{_external_base(request)}/twilio/voice/no-answer"
                 f"?tenant={urllib.parse.quote(tenant_id)}"
             )
             twiml = (
@@ -329,7 +391,7 @@ async def twilio_voice(
                 "</Dial>"
                 "</Response>"
             )
-            print(f"[VOICE] direct-dial: ringing owner first for tenant={tenant_id!r}", flush=True)
+            log.info("[VOICE] direct-dial: ringing owner first for tenant=%r", tenant_id)
             return PlainTextResponse(twiml, media_type="application/xml")
 
     twiml = (
@@ -338,7 +400,7 @@ async def twilio_voice(
         f'<Redirect method="POST">{vapi_url}</Redirect>'
         "</Response>"
     )
-    print(f"[VOICE] → Vapi (forwarding={bool(forwarded_from_raw)!r})", flush=True)
+    log.info("[VOICE] → Vapi (forwarding=%r)", bool(forwarded_from_raw))
     return PlainTextResponse(twiml, media_type="application/xml")
 
 @router.post("/twilio/voice/recorded", response_class=PlainTextResponse)
@@ -351,11 +413,11 @@ async def twilio_voice_recorded(
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid Twilio signature")
 
     try:
-        form = await request.form()
+        form = await _cached_form(request)
     except Exception:
         form = {}
 
-    print(f"[RECORDED] skipping Twilio voicemail persistence for tenant={tenant_id!r}", flush=True)
+    log.info("[RECORDED] skipping Twilio voicemail persistence for tenant=%r", tenant_id)
 
     vr = VoiceResponse()
     vr.say("Thanks. Goodbye.", voice="alice")
@@ -377,13 +439,13 @@ async def twilio_voice_no_answer(
     if not await _verify_twilio_signature(request):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid Twilio signature")
     try:
-        form = await request.form()
+        form = await _cached_form(request)
     except Exception:
         form = {}
 
     dial_status = (form.get("DialCallStatus") or "").strip().lower()
     call_sid = (form.get("CallSid") or "").strip()
-    print(f"[NO-ANSWER] tenant={tenant_id!r} dial_status={dial_status!r} call_sid={call_sid}", flush=True)
+    log.info("[NO-ANSWER] tenant=%r dial_status=%r call_sid=%s", tenant_id, dial_status, call_sid)
 
     if dial_status in ("no-answer", "busy", "failed", "canceled"):
         forwarded_from = cache_lookup(call_sid) or ""
@@ -396,11 +458,11 @@ async def twilio_voice_no_answer(
             f'<Redirect method="POST">{vapi_url}</Redirect>'
             "</Response>"
         )
-        print(f"[NO-ANSWER] owner didn't answer ({dial_status!r}) → Vapi", flush=True)
+        log.info("[NO-ANSWER] owner didn't answer (%r) → Vapi", dial_status)
         return PlainTextResponse(twiml, media_type="application/xml")
 
     # Owner answered (dial_status == "completed") — call is already connected
-    print(f"[NO-ANSWER] owner answered (status={dial_status!r})", flush=True)
+    log.info("[NO-ANSWER] owner answered (status=%r)", dial_status)
     return PlainTextResponse(
         '<?xml version="1.0" encoding="UTF-8"?><Response></Response>',
         media_type="application/xml",
@@ -430,31 +492,36 @@ async def twilio_voice_missed(
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid Twilio signature")
 
     try:
-        form = await request.form()
+        form = await _cached_form(request)
     except Exception as e:
-        print(f"[MISSED] form parse error: {e}")
+        log.warning("[MISSED] form parse error: %s", e)
         form = {}
 
     call_status = (form.get("CallStatus") or "").strip().lower()
     from_num_raw = (form.get("From") or "").strip()
-    from_num = normalize_us_phone(from_num_raw) or from_num_raw
+    from_num = try_normalize_us_phone(from_num_raw) or from_num_raw
     caller = (form.get("CallerName") or "").strip()
     call_sid = (form.get("CallSid") or "").strip()
 
-    print(f"[MISSED] tenant={tenant_id} status={call_status} from={from_num} sid={call_sid}")
+    log.info("[MISSED] tenant=%s status=%s from=%s sid=%s", tenant_id, call_status, from_num, call_sid)
 
-    print(f"[MISSED] skipping Twilio missed-call save/SMS for tenant={tenant_id!r}", flush=True)
+    log.info("[MISSED] skipping Twilio missed-call save/SMS for tenant=%r", tenant_id)
     return PlainTextResponse("", status_code=204)
 
 
-@router.get("/twilio/voice")
-def twilio_voice_get():
-    twiml = f"""<?xml version="1.0" encoding="UTF-8"?>
+# Static GET body — rendered once at import. A fresh Response wraps it per call:
+# middleware (CORS, BaseHTTPMiddleware) appends to a response's raw_headers list,
+# so sharing one Response instance across requests would leak headers.
+_TWIML_GET_BYTES = f"""<?xml version="1.0" encoding="UTF-8"?>
 <Response>
   <Say voice="alice">Thanks for calling {config.FROM_NAME}. We just texted you our booking link. We'll be in touch shortly.</Say>
   <Hangup/>
-</Response>"""
-    return Response(content=twiml, media_type="application/xml")
+</Response>""".encode("utf-8")
+
+
+@router.get("/twilio/voice")
+def twilio_voice_get():
+    return Response(content=_TWIML_GET_BYTES, media_type="application/xml")
 
 # --- DEBUG helpers (protected by /debug/* middleware) ---
 
@@ -476,7 +543,7 @@ def debug_twilio_sig(request: Request, From: str, CallerName: str):
     base = f"{request.url.scheme}://{request.headers.get('host')}"
     url = f"{base}/twilio/voice"
     params = {"From": From, "CallerName": CallerName}
-    sig = RequestValidator(config.TWILIO_AUTH_TOKEN).compute_signature(url, params)
+    sig = _validator(config.TWILIO_AUTH_TOKEN).compute_signature(url, params)
     return {"url": url, "sig": sig}
 
 @router.get("/debug/twilio-sig-recorded")
@@ -484,5 +551,5 @@ def debug_twilio_sig_recorded(request: Request, From: str, CallerName: str, Reco
     base = f"{request.url.scheme}://{request.headers.get('host')}"
     url = f"{base}/twilio/voice/recorded"
     params = {"From": From, "CallerName": CallerName, "RecordingUrl": RecordingUrl}
-    sig = RequestValidator(config.TWILIO_AUTH_TOKEN).compute_signature(url, params)
+    sig = _validator(config.TWILIO_AUTH_TOKEN).compute_signature(url, params)
     return {"url": url, "sig": sig}
@@ -0,0 +1,37 @@
+# app/services/dedupe.py
+import logging
+from datetime import datetime, timezone
+
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlmodel import Session
+
+from app.models import WebhookDedup
+
+log = logging.getLogger(__name__)
+
+
+def _insert_for(session: Session):
+    """Dialect-specific insert() so we can use ON CONFLICT DO NOTHING (postgres in prod, sqlite locally)."""
+    if session.get_bind().dialect.name == "sqlite":
+        return sqlite_insert
+    return pg_insert
+
+
+def dedupe_insert(session: Session, source: str, event_id: str, log_prefix: str = "DEDUPE") -> bool:
+    """
+    Record (source, event_id) in WebhookDedup with a single INSERT .. ON CONFLICT DO NOTHING.
+    True the first time a pair is seen; False for repeats and on errors.
+    """
+    try:
+        session.rollback()  # clear any aborted transaction left by earlier errors
+        stmt = _insert_for(session)(WebhookDedup).values(
+            source=source, event_id=event_id, created_at=datetime.now(timezone.utc)
+        ).on_conflict_do_nothing(index_elements=["source", "event_id"]).returning(WebhookDedup.id)
+        first_time = session.exec(stmt).scalar() is not None
+        session.commit()
+        return first_time
+    except Exception as e:
+        session.rollback()
+        log.error("[%s] dedupe insert error: %s", log_prefix, e)
+        return False
@@ -1,11 +1,15 @@
 # app/services/email.py
 from __future__ import annotations
 
+import hashlib
 import logging
 import ssl
 import smtplib
+import threading
+import time
 from email.message import EmailMessage
 from datetime import datetime
+from functools import lru_cache
 from typing import Iterable
 from zoneinfo import ZoneInfo  # stdlib in Python 3.9+
 
@@ -17,6 +21,13 @@ log = logging.getLogger(__name__)
 
 
 def _dedup_preserve(emails: list[str]) -> list[str]:
+    # office + customer (<= 2) is the common case: compare directly, no set
+    if len(emails) <= 2:
+        out = [e for e in emails if (e or "").strip()]
+        if len(out) == 2 and out[0].strip().lower() == out[1].strip().lower():
+            out.pop()
+        return out
+
     seen = set()
     out = []
     for e in emails:
@@ -36,6 +47,76 @@ def _as_list(v: str | Iterable[str] | None) -> list[str]:
     return [x for x in v if x]
 
 
+# ---- SMTP connection reuse ---------------------------------------------------
+#
+# One logged-in connection per thread, keyed by (host, port, user). Reused while
+# it answers NOOP and hasn't sat idle longer than _SMTP_IDLE_SECONDS, so reminder
+# fan-out pays the TCP + STARTTLS + AUTH handshake once instead of per message.
+
+_SMTP_IDLE_SECONDS = 60
+_smtp_local = threading.local()
+
+
+def _smtp_connect(host: str, port: int, user: str, pwd: str) -> smtplib.SMTP:
+    print(f"[SMTP] connecting to {host}:{port} ...")
+    context = ssl.create_default_context()
+    s = smtplib.SMTP(host, port, timeout=20)
+    try:
+        s.set_debuglevel(1)  # prints full SMTP conversation to stdout
+        print("[SMTP] connected — sending EHLO ...")
+        s.ehlo()
+        print("[SMTP] starting TLS ...")
+        s.starttls(context=context)
+        s.ehlo()
+        print(f"[SMTP] logging in as {user!r} ...")
+        s.login(user, pwd)
+        print("[SMTP] login OK")
+    except Exception:
+        s.close()
+        raise
+    return s
+
+
+def _smtp_get(host: str, port: int, user: str, pwd: str) -> smtplib.SMTP:
+    # a rotated password must not keep riding the old authenticated session
+    key = (host, port, user, hashlib.sha256(pwd.encode()).hexdigest())
+    cached = getattr(_smtp_local, "conn", None)
+    if cached is not None:
+        cached_key, conn, last_used = cached
+        if cached_key == key and time.monotonic() - last_used < _SMTP_IDLE_SECONDS:
+            try:
+                if conn.noop()[0] == 250:
+                    return conn
+            except (smtplib.SMTPException, OSError):
+                pass
+        _smtp_discard()
+
+    conn = _smtp_connect(host, port, user, pwd)
+    _smtp_local.conn = (key, conn, time.monotonic())
+    return conn
+
+
+def _smtp_release() -> None:
+    """Mark this thread's connection as just used (keeps it out of idle expiry)."""
+    cached = getattr(_smtp_local, "conn", None)
+    if cached is not None:
+        _smtp_local.conn = (cached[0], cached[1], time.monotonic())
+
+
+def _smtp_discard() -> None:
+    cached = getattr(_smtp_local, "conn", None)
+    _smtp_local.conn = None
+    if cached is None:
+        return
+    try:
+        cached[1].quit()
+    except Exception:
+        try:
+            cached[1].close()
+        except Exception:
+            pass
+
+
 def _send_via_smtp(
     to: list[str],
     subject: str,
@@ -83,20 +164,19 @@ def _send_via_smtp(
     if html:
         msg.add_alternative(html, subtype="html")
 
+    sent = False
     try:
-        print(f"[SMTP] connecting to {host}:{port} ...")
-        context = ssl.create_default_context()
-        with smtplib.SMTP(host, port, timeout=20) as s:
-            s.set_debuglevel(1)  # prints full SMTP conversation to stdout
-            print("[SMTP] connected — sending EHLO ...")
-            s.ehlo()
-            print("[SMTP] starting TLS ...")
-            s.starttls(context=context)
-            s.ehlo()
-            print(f"[SMTP] logging in as {user!r} ...")
-            s.login(user, pwd)
-            print("[SMTP] login OK — sending message ...")
+        s = _smtp_get(host, port, user, pwd)
+        print("[SMTP] sending message ...")
+        try:
             s.send_message(msg)
+        except smtplib.SMTPServerDisconnected:
+            # pooled connection dropped between NOOP and send — reconnect once
+            _smtp_discard()
+            s = _smtp_get(host, port, user, pwd)
+            s.send_message(msg)
+        _smtp_release()
+        sent = True
         print(f"[SMTP] send OK → to={to} subject={subject!r}")
         log.info("[SMTP] send OK → to=%s subject=%r", to, subject)
         return True
@@ -120,6 +200,10 @@ def _send_via_smtp(
         print(f"[SMTP] unexpected error — {type(e).__name__}: {e}")
         log.error("[SMTP] unexpected error — %s: %s", type(e).__name__, e)
         return False
+    finally:
+        if not sent:
+            # never hand a half-broken connection to the next send
+            _smtp_discard()
 
 
 # ---- public API --------------------------------------------------------------
@@ -155,20 +239,64 @@ def send_email(
 # ---- office email helper -----------------------------------------------------
 
 
+@lru_cache(maxsize=1)
+def _parse_office_map(raw: str) -> dict[str, str]:
+    """Parse "tenant:email,..." once per distinct raw string."""
+    mapping: dict[str, str] = {}
+    for part in [p.strip() for p in raw.split(",") if ":" in p]:
+        k, v = part.split(":", 1)
+        mapping[k.strip()] = v.strip()
+    return mapping
+
+
 def _office_email_for_tenant(tenant: str) -> str:
     """
     Optionally map tenant -> office email via config.TENANT_OFFICE_EMAILS like:
       "default:owner@torevez.com,acme:dispatch@acme.com"
     Falls back to config.EMAIL_OFFICE or config.FROM_EMAIL.
     """
-    raw = getattr(config, "TENANT_OFFICE_EMAILS", "") or ""
-    mapping: dict[str, str] = {}
-    for part in [p.strip() for p in raw.split(",") if ":" in p]:
-        k, v = part.split(":", 1)
-        mapping[k.strip()] = v.strip()
+    mapping = _parse_office_map(getattr(config, "TENANT_OFFICE_EMAILS", "") or "")
     return mapping.get(tenant) or getattr(config, "EMAIL_OFFICE", None) or config.FROM_EMAIL
 
 
+@lru_cache(maxsize=32)
+def _zone(tz_name: str) -> ZoneInfo:
+    return ZoneInfo(tz_name)
+
+
+def _tz_name() -> str:
+    tz_name = getattr(config, "TZ", None)
+    if not tz_name and hasattr(config, "settings"):
+        tz_name = getattr(config.settings, "TZ", "America/New_York")
+    return tz_name or "America/New_York"
+
+
+@lru_cache(maxsize=512)
+def _parse_iso(iso: str) -> datetime | None:
+    """Parse an ISO string (trailing Z ok) once; None if unparseable."""
+    # 3.11's C fromisoformat accepts "Z" directly and is ~40x faster than a
+    # fixed-format strptime, so no string rewrite or strptime fast path.
+    try:
+        return datetime.fromisoformat(iso)
+    except Exception:
+        return None
+
+
+@lru_cache(maxsize=512)
+def _local_time_fmt(iso: str, tz: ZoneInfo, now_year: int) -> str:
+    dt = _parse_iso(iso)
+    if dt is None:
+        return iso
+    dt = dt.astimezone(tz)
+
+    if dt.year == now_year:
+        s = dt.strftime("%m/%d %I:%M %p %Z")
+    else:
+        s = dt.strftime("%m/%d/%Y %I:%M %p %Z")
+
+    return s.replace("/0", "/").replace(" 0", " ")
+
+
 def _local_time_str(iso: str) -> str:
     """
     Pretty local time formatter for emails.
@@ -178,22 +306,8 @@ def _local_time_str(iso: str) -> str:
       12/5/2026 2:00 PM EST   (if different year)
     """
     try:
-        tz_name = getattr(config, "TZ", None)
-        if not tz_name and hasattr(config, "settings"):
-            tz_name = getattr(config.settings, "TZ", "America/New_York")
-        tz_name = tz_name or "America/New_York"
-
-        tz = ZoneInfo(tz_name)
-        dt = datetime.fromisoformat(iso.replace("Z", "+00:00")).astimezone(tz)
-        now_year = datetime.now(tz).year
-
-        if dt.year == now_year:
-            s = dt.strftime("%m/%d %I:%M %p %Z")
-        else:
-            s = dt.strftime("%m/%d/%Y %I:%M %p %Z")
-
-        s = s.replace("/0", "/").replace(" 0", " ")
-        return s
+        tz = _zone(_tz_name())
+        return _local_time_fmt(iso, tz, datetime.now(tz).year)
     except Exception:
         return iso
 
@@ -201,22 +315,18 @@ def _local_time_str(iso: str) -> str:
 # ---- booking confirmation ----------------------------------------------------
 
 
-def _booking_subject(tenant: str, service: str, name: str, starts_iso: str) -> str:
-    try:
-        dt = datetime.fromisoformat(starts_iso.replace("Z", "+00:00"))
-        when = dt.strftime("%b %d, %I:%M %p")
-    except Exception:
-        when = starts_iso
+def _booking_subject(tenant: str, service: str, name: str, starts_iso: str, start_dt: datetime | None) -> str:
+    when = start_dt.strftime("%b %d, %I:%M %p") if start_dt else starts_iso
     return f"[{tenant}] Booked: {service} for {name} @ {when}"
 
 
-def _booking_text(tenant: str, p: dict) -> str:
+def _booking_text(tenant: str, p: dict, when_local: str) -> str:
     lines = [
         f"Hi {p.get('name', '')},",
         "",
         "Your appointment is confirmed.",
         f"Service: {p.get('service', 'default')}",
-        f"When:   {_local_time_str(p.get('starts_at_iso', ''))}",
+        f"When:   {when_local}",
         f"Phone:  {p.get('phone', '')}",
         f"Address:{p.get('address', '')}",
         "",
@@ -231,7 +341,7 @@ def _booking_text(tenant: str, p: dict) -> str:
     return "\n".join(lines)
 
 
-def _booking_html(tenant: str, p: dict) -> str:
+def _booking_html(tenant: str, p: dict, when_local: str) -> str:
     resched_html = (
         f'<p><a href="{p.get("reschedule_url")}">Reschedule your appointment</a></p>'
         if p.get("reschedule_url")
@@ -240,7 +350,7 @@ def _booking_html(tenant: str, p: dict) -> str:
     return f"""
     <div style="font-family:system-ui,-apple-system,Segoe UI,Roboto,Arial">
       <p>Hi {p.get('name','')},</p>
-      <p>Your <b>{p.get('service','default')}</b> is scheduled for <b>{_local_time_str(p.get('starts_at_iso',''))}</b>.</p>
+      <p>Your <b>{p.get('service','default')}</b> is scheduled for <b>{when_local}</b>.</p>
       <p><b>Phone:</b> {p.get('phone','')}&nbsp;&nbsp; <b>Address:</b> {p.get('address','')}</p>
       {resched_html}
       <p>If you need to reschedule, just reply to this email.</p>
@@ -258,14 +368,18 @@ def send_booking_confirmation(tenant: str, payload: dict) -> bool:
       - CUSTOMER (if provided)
     De-dupes automatically so SendGrid/SMTP never gets duplicates.
     """
+    # parse / localize the start time once for subject + text + html
+    starts_iso = payload.get("starts_at_iso", "")
+    when_local = _local_time_str(starts_iso)
     subject = _booking_subject(
         tenant,
         payload.get("service", "default"),
         payload.get("name", ""),
-        payload.get("starts_at_iso", ""),
+        starts_iso,
+        _parse_iso(starts_iso),
     )
-    text = _booking_text(tenant, payload)
-    html = _booking_html(tenant, payload)
+    text = _booking_text(tenant, payload, when_local)
+    html = _booking_html(tenant, payload, when_local)
 
     office = _office_email_for_tenant(tenant)
     cust = (payload.get("email") or "").strip()
@@ -285,26 +399,24 @@ def send_booking_confirmation(tenant: str, payload: dict) -> bool:
 # ---- reminder emails (24h / 2h / etc.) --------------------------------------
 
 
-def _reminder_subject(tenant: str, service: str, name: str, starts_iso: str, window: str) -> str:
+def _reminder_subject(
+    tenant: str, service: str, name: str, starts_iso: str, start_dt: datetime | None, window: str
+) -> str:
     """
     window: "24h", "2h", "review", etc.
     """
-    try:
-        dt = datetime.fromisoformat(starts_iso.replace("Z", "+00:00"))
-        when = dt.strftime("%b %d, %I:%M %p")
-    except Exception:
-        when = starts_iso
+    when = start_dt.strftime("%b %d, %I:%M %p") if start_dt else starts_iso
     return f"[{tenant}] Reminder ({window}): {service} for {name} @ {when}"
 
 
-def _reminder_text(tenant: str, p: dict, window: str) -> str:
+def _reminder_text(tenant: str, p: dict, window: str, when_local: str) -> str:
     label = "appointment" if window not in ("24h", "2h") else f"{window} appointment"
     lines = [
         f"Hi {p.get('name','')},",
         "",
         f"This is your {label} reminder.",
         f"Service: {p.get('service','default')}",
-        f"When:   {_local_time_str(p.get('starts_at_iso',''))}",
+        f"When:   {when_local}",
         "",
     ]
     if p.get("reschedule_url"):
@@ -317,7 +429,7 @@ def _reminder_text(tenant: str, p: dict, window: str) -> str:
     return "\n".join(lines)
 
 
-def _reminder_html(tenant: str, p: dict, window: str) -> str:
+def _reminder_html(tenant: str, p: dict, window: str, when_local: str) -> str:
     label = "appointment" if window not in ("24h", "2h") else f"{window} appointment"
     resched_html = (
         f'<p><a href="{p.get("reschedule_url")}">Reschedule your appointment</a></p>'
@@ -329,7 +441,7 @@ def _reminder_html(tenant: str, p: dict, window: str) -> str:
       <p>Hi {p.get('name','')},</p>
       <p>This is your <b>{label}</b> reminder.</p>
       <p><b>Service:</b> {p.get('service','default')}</p>
-      <p><b>When:</b> {_local_time_str(p.get('starts_at_iso',''))}</p>
+      <p><b>When:</b> {when_local}</p>
       {resched_html}
       <p>If you need to reschedule, just reply to this email.</p>
       <p>— {getattr(config, 'FROM_NAME', tenant)} Team</p>
@@ -481,15 +593,19 @@ def send_booking_reminder(tenant: str, payload: dict, window: str) -> bool:
       - OFFICE (always)
       - CUSTOMER (if email present)
     """
+    # parse / localize the start time once for subject + text + html
+    starts_iso = payload.get("starts_at_iso", "")
+    when_local = _local_time_str(starts_iso)
     subject = _reminder_subject(
         tenant,
         payload.get("service", "default"),
         payload.get("name", ""),
-        payload.get("starts_at_iso", ""),
+        starts_iso,
+        _parse_iso(starts_iso),
         window,
     )
-    text = _reminder_text(tenant, payload, window)
-    html = _reminder_html(tenant, payload, window)
+    text = _reminder_text(tenant, payload, window, when_local)
+    html = _reminder_html(tenant, payload, window, when_local)
 
     office = _office_email_for_tenant(tenant)
     cust = (payload.get("email") or "").strip()
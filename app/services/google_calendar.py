@@ -1,5 +1,9 @@
 from __future__ import annotations
 import os, json, re
+import threading
+import heapq
+from bisect import bisect_right
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Tuple
 from datetime import datetime, timedelta, time as dtime, timezone
@@ -11,6 +15,10 @@ from google.auth.transport.requests import Request
 from googleapiclient.discovery import build
 from app import config
 
+@lru_cache(maxsize=64)
+def _zone(tz_str: str) -> ZoneInfo:
+    return ZoneInfo(tz_str)
+
 # --- scopes & OAuth flow
 def _scopes() -> List[str]:
     s = os.getenv("GOOGLE_SCOPES", "https://www.googleapis.com/auth/calendar.readonly")
@@ -50,11 +58,33 @@ def load_creds() -> Credentials | None:
         creds.refresh(Request()); save_creds(creds)
     return creds
 
+# build() re-parses the discovery document and constructs the whole resource
+# tree every call. Keep one service per (thread, access token): a refreshed
+# token gets a fresh service, and nothing is shared across threads because
+# googleapiclient's httplib2 transport isn't thread-safe.
+_svc_local = threading.local()
+_SVC_CACHE_MAX = 16
+
+def _calendar_service(creds: Credentials):
+    token = creds.token
+    if not token:
+        return build("calendar", "v3", credentials=creds, cache_discovery=False)
+    cache = getattr(_svc_local, "svcs", None)
+    if cache is None:
+        cache = _svc_local.svcs = {}
+    svc = cache.get(token)
+    if svc is None:
+        if len(cache) >= _SVC_CACHE_MAX:
+            cache.clear()
+        svc = build("calendar", "v3", credentials=creds, cache_discovery=False)
+        cache[token] = svc
+    return svc
+
 def ensure_service():
     creds = load_creds()
     if not creds:
         raise PermissionError("Not authorized with Google yet")
-    svc = build("calendar", "v3", credentials=creds, cache_discovery=False)
+    svc = _calendar_service(creds)
     return svc, creds
 
 # --- calendar helpers
@@ -62,25 +92,27 @@ def freebusy(svc, *, start_iso: str, end_iso: str, tz_str: str, calendar_ids: Li
     body = {"timeMin": start_iso, "timeMax": end_iso, "timeZone": tz_str,
             "items": [{"id": c} for c in calendar_ids if c]}
     resp = svc.freebusy().query(body=body).execute()
-    intervals: List[Tuple[datetime, datetime]] = []
-    for info in resp.get("calendars", {}).values():
-        for b in info.get("busy", []):
-            intervals.append((dateparser.isoparse(b["start"]), dateparser.isoparse(b["end"])))
-    intervals.sort(key=lambda x: x[0])
+    # Google returns each calendar's busy list in start order — k-way merge instead of a full sort
+    per_cal = [
+        [(dateparser.isoparse(b["start"]), dateparser.isoparse(b["end"])) for b in info.get("busy", [])]
+        for info in resp.get("calendars", {}).values()
+    ]
     merged: List[Tuple[datetime, datetime]] = []
-    for s, e in intervals:
+    for s, e in heapq.merge(*per_cal, key=lambda x: x[0]):
         if not merged or s > merged[-1][1]:
             merged.append((s, e))
         else:
             merged[-1] = (merged[-1][0], max(merged[-1][1], e))
     return merged
 
+_HHMM = tuple(f"{h:02d}:{m:02d}" for h in range(24) for m in range(60))
+
 def generate_slots(
     *, start: datetime, end: datetime, tz_str: str,
     busy: List[Tuple[datetime, datetime]],
     business_hours: str, slot_minutes: int, buffer_minutes: int = 0
 ) -> List[dict]:
-    local = ZoneInfo(tz_str)
+    local = _zone(tz_str)
     start = (start if start.tzinfo else start.replace(tzinfo=timezone.utc)).astimezone(local)
     end = (end if end.tzinfo else end.replace(tzinfo=timezone.utc)).astimezone(local)
 
@@ -88,30 +120,69 @@ def generate_slots(
     bh_start = dtime.fromisoformat(bh_start_s)
     bh_end = dtime.fromisoformat(bh_end_s)
 
+    buffer = timedelta(minutes=buffer_minutes)
+    slot = timedelta(minutes=slot_minutes)
+
     expanded = []
     for s, e in busy:
-        s = (s if s.tzinfo else s.replace(tzinfo=timezone.utc)).astimezone(local) - timedelta(minutes=buffer_minutes)
-        e = (e if e.tzinfo else e.replace(tzinfo=timezone.utc)).astimezone(local) + timedelta(minutes=buffer_minutes)
+        s = (s if s.tzinfo else s.replace(tzinfo=timezone.utc)).astimezone(local) - buffer
+        e = (e if e.tzinfo else e.replace(tzinfo=timezone.utc)).astimezone(local) + buffer
         expanded.append((s, e))
+    expanded.sort(key=lambda x: x[0])
+    # Coalesce overlaps (buffers can make neighbours overlap) so ends are
+    # ascending too — lets each day bisect straight to its first candidate.
+    merged: List[Tuple[datetime, datetime]] = []
+    for s, e in expanded:
+        if merged and s <= merged[-1][1]:
+            if e > merged[-1][1]:
+                merged[-1] = (merged[-1][0], e)
+        else:
+            merged.append((s, e))
+    expanded = merged
+    busy_ends = [e for _, e in expanded]
+    n_busy = len(expanded)
 
     out: List[dict] = []
-    day = start.date()
-    while day <= end.date():
+    p = 0  # sweep pointer into expanded; slot_start only moves forward
+    first_day = start.date()
+    n_days = (end.date() - first_day).days + 1
+    for i in range(n_days):
+        day = first_day + timedelta(days=i)
         day_start = datetime.combine(day, bh_start, tzinfo=local)
         day_end = datetime.combine(day, bh_end, tzinfo=local)
-        cur = max(day_start, start); stop = min(day_end, end)
-        while cur + timedelta(minutes=slot_minutes) <= stop:
-            slot_start = cur; slot_end = cur + timedelta(minutes=slot_minutes)
-            conflict = any(not (slot_end <= bs or slot_start >= be) for bs, be in expanded)
-            if not conflict:
-                out.append({"start": slot_start.isoformat(), "end": slot_end.isoformat()})
-            cur += timedelta(minutes=slot_minutes)
-        day = day + timedelta(days=1)
+        # only the first/last day can be clipped by start/end
+        slot_start = max(day_start, start) if i == 0 else day_start
+        stop = min(day_end, end) if i == n_days - 1 else day_end
+        slot_end = slot_start + slot
+        # skip busy blocks that ended before this day's first slot (overnight etc.)
+        p = max(p, bisect_right(busy_ends, slot_start))
+        # Whole-minute slots on a day with one UTC offset (no DST switch inside
+        # business hours) are emitted from a per-day prefix/suffix + "HH:MM" table;
+        # anything else falls back to isoformat().
+        fast = (
+            slot_start.second == 0 and slot_start.microsecond == 0
+            and day_start.utcoffset() == day_end.utcoffset()
+        )
+        if fast:
+            prefix = day.isoformat() + "T"
+            suffix = ":00" + day_start.isoformat()[19:]
+            minute = slot_start.hour * 60 + slot_start.minute
+        while slot_end <= stop:
+            while p < n_busy and expanded[p][1] <= slot_start:
+                p += 1
+            if not (p < n_busy and expanded[p][0] < slot_end):
+                if fast:
+                    out.append({"start": prefix + _HHMM[minute] + suffix,
+                                "end": prefix + _HHMM[minute + slot_minutes] + suffix})
+                else:
+                    out.append({"start": slot_start.isoformat(), "end": slot_end.isoformat()})
+            slot_start = slot_end
+            slot_end = slot_start + slot
+            if fast:
+                minute += slot_minutes
     return out
-def create_event(
-    svc,
+def event_body(
     *,
-    calendar_id: str,
     summary: str,
     description: str,
     start_dt,
@@ -119,15 +190,14 @@ def create_event(
     tz_str: str,
     attendee_email: str | None = None,
     attendee_name: str | None = None,
-):
-    """
-    Inserts a timed event. Datetimes can be naive or tz-aware; we coerce to tz_str.
-    Returns the created event dict (includes 'id' and 'htmlLink').
-    """
+) -> dict:
+    """Build an events.insert body. Datetimes can be naive (UTC) or tz-aware; we coerce to tz_str."""
+    local = _zone(tz_str)
+
     def _to_local_iso(dt):
         if dt.tzinfo is None:
             dt = dt.replace(tzinfo=timezone.utc)
-        return dt.astimezone(ZoneInfo(tz_str)).isoformat(timespec="seconds")
+        return dt.astimezone(local).isoformat(timespec="seconds")
 
     body = {
         "summary": summary,
@@ -144,11 +214,63 @@ def create_event(
         attendees.append(a)
     if attendees:
         body["attendees"] = attendees
+    return body
 
+
+def create_event(
+    svc,
+    *,
+    calendar_id: str,
+    summary: str,
+    description: str,
+    start_dt,
+    end_dt,
+    tz_str: str,
+    attendee_email: str | None = None,
+    attendee_name: str | None = None,
+):
+    """
+    Inserts a timed event. Datetimes can be naive or tz-aware; we coerce to tz_str.
+    Returns the created event dict (includes 'id' and 'htmlLink').
+    """
+    body = event_body(
+        summary=summary,
+        description=description,
+        start_dt=start_dt,
+        end_dt=end_dt,
+        tz_str=tz_str,
+        attendee_email=attendee_email,
+        attendee_name=attendee_name,
+    )
     ev = svc.events().insert(calendarId=calendar_id, body=body).execute()
     return ev
 
 
+_BATCH_LIMIT = 50  # Calendar API caps a batch at 50 calls
+
+
+def create_events_batch(svc, *, calendar_id: str, bodies: List[dict]) -> List[dict | None]:
+    """
+    Insert many events with batched HTTP requests (one round-trip per 50 events).
+    Build bodies with event_body(). Returns one entry per body, in order:
+    the created event dict, or None if that insert failed.
+    """
+    results: List[dict | None] = [None] * len(bodies)
+
+    def _cb(request_id, response, exception):
+        if exception is not None:
+            print(f"[GCAL BATCH] insert {request_id} failed: {exception!r}")
+            return
+        results[int(request_id)] = response
+
+    for off in range(0, len(bodies), _BATCH_LIMIT):
+        batch = svc.new_batch_http_request(callback=_cb)
+        for i, body in enumerate(bodies[off:off + _BATCH_LIMIT], start=off):
+            batch.add(svc.events().insert(calendarId=calendar_id, body=body), request_id=str(i))
+        batch.execute()
+    return results
+
+
 def get_service_for_tenant(tenant, session):
     """
     Return an authorized Google Calendar API service for the given Tenant row.
@@ -199,7 +321,7 @@ def get_service_for_tenant(tenant, session):
             session.commit()
             return None
 
-    return build("calendar", "v3", credentials=creds, cache_discovery=False)
+    return _calendar_service(creds)
 
 
 # ---------------------------------------------------------------------------
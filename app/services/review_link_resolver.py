@@ -1,16 +1,49 @@
 import os
+from collections import OrderedDict
 import requests
+from requests.adapters import HTTPAdapter
 from sqlmodel import Session, select
 from app.models import Tenant
+from app.services.sms import invalidate_brand
 
 GOOGLE_API_KEY = os.getenv("GOOGLE_MAPS_API_KEY", "")
 
-def resolve_and_save_google_review_link(db: Session, tenant_slug: str) -> dict:
+# Shared keep-alive session: consecutive resolves reuse the TLS connection to maps.googleapis.com
+_HTTP = requests.Session()
+_HTTP.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=50))
+
+# query -> (place_id, name, formatted_address); place ids are stable, so a
+# successful lookup is reused (misses aren't cached). Small LRU so the
+# process doesn't grow with every distinct query it has ever seen.
+_PLACE_CACHE_MAX = 256
+_PLACE_CACHE: "OrderedDict[str, tuple]" = OrderedDict()
+
+
+def _cached_place(q: str):
+    place = _PLACE_CACHE.get(q)
+    if place is not None:
+        _PLACE_CACHE.move_to_end(q)
+    return place
+
+
+def _remember_place(q: str, place: tuple) -> None:
+    _PLACE_CACHE[q] = place
+    _PLACE_CACHE.move_to_end(q)
+    while len(_PLACE_CACHE) > _PLACE_CACHE_MAX:
+        _PLACE_CACHE.popitem(last=False)
+
+
+def resolve_and_save_google_review_link(db: Session, tenant_slug: str, force_refresh: bool = False) -> dict:
     # fetch tenant
     t = db.exec(select(Tenant).where(Tenant.slug == tenant_slug)).first()
     if not t:
         return {"ok": False, "error": "tenant_not_found"}
 
+    # warm path: already resolved — skip the Places round-trip unless asked
+    existing = (t.review_google_url or "").strip()
+    if existing and not force_refresh:
+        return {"ok": True, "review_google_url": existing, "cached": True}
+
     if not GOOGLE_API_KEY:
         return {"ok": False, "error": "missing_api_key"}
 
@@ -24,23 +57,29 @@ def resolve_and_save_google_review_link(db: Session, tenant_slug: str) -> dict:
     else:
         return {"ok": False, "error": "missing_profile_fields"}
 
-    # Google Places Find Place
-    url = "https://maps.googleapis.com/maps/api/place/findplacefromtext/json"
-    params = {
-        "input": q,
-        "inputtype": "textquery",
-        "fields": "place_id,name,formatted_address",
-        "key": GOOGLE_API_KEY,
-    }
-    r = requests.get(url, params=params, timeout=10)
-    data = r.json()
-    candidates = (data or {}).get("candidates", [])
-    if not candidates:
-        return {"ok": False, "error": "no_match"}
-
-    place_id = candidates[0].get("place_id")
-    if not place_id:
-        return {"ok": False, "error": "no_place_id"}
+    place = None if force_refresh else _cached_place(q)
+    if place is None:
+        # Google Places Find Place
+        url = "https://maps.googleapis.com/maps/api/place/findplacefromtext/json"
+        params = {
+            "input": q,
+            "inputtype": "textquery",
+            "fields": "place_id,name,formatted_address",
+            "key": GOOGLE_API_KEY,
+        }
+        r = _HTTP.get(url, params=params, timeout=10)
+        data = r.json()
+        candidates = (data or {}).get("candidates", [])
+        if not candidates:
+            return {"ok": False, "error": "no_match"}
+
+        if not candidates[0].get("place_id"):
+            return {"ok": False, "error": "no_place_id"}
+
+        place = (candidates[0]["place_id"], candidates[0].get("name"), candidates[0].get("formatted_address"))
+        _remember_place(q, place)
+
+    place_id, matched_name, matched_address = place
 
     review_url = f"https://search.google.com/local/writereview?placeid={place_id}"
 
@@ -48,6 +87,7 @@ def resolve_and_save_google_review_link(db: Session, tenant_slug: str) -> dict:
     t.review_google_url = review_url
     db.add(t)
     db.commit()
+    invalidate_brand(t.slug)
     db.refresh(t)
 
-    return {"ok": True, "review_google_url": review_url, "matched_name": candidates[0].get("name"), "matched_address": candidates[0].get("formatted_address")}
+    return {"ok": True, "review_google_url": review_url, "matched_name": matched_name, "matched_address": matched_address}
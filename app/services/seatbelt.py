@@ -1,11 +1,17 @@
 import json
-from typing import Any, Optional
+import orjson
+from typing import Any, List, Optional
 from sqlmodel import Session
 
 from app.models import AuditEvent
 
 
 def _safe_json(payload: Any) -> str:
+    try:
+        return orjson.dumps(payload, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+    except Exception:
+        pass
+    # stdlib handles what orjson refuses (e.g. ints beyond 64 bits)
     try:
         return json.dumps(payload, default=str)
     except Exception:
@@ -34,13 +40,46 @@ def backup_event(
             ok=ok,
             error=error,
         )
+        # id is a client-side uuid — read it before commit so we don't pay a
+        # refresh()/expired-attribute SELECT just to return it.
+        row_id = row.id
         session.add(row)
         session.commit()
-        session.refresh(row)
-        return row.id
+        return row_id
     except Exception:
         try:
             session.rollback()
         except Exception:
             pass
         return ""
+
+
+def backup_events_bulk(session: Session, events: List[dict]) -> List[str]:
+    """
+    Write several audit events with a single commit.
+    Each dict takes backup_event's keyword args (category, action, tenant_id, ...).
+    Best-effort like backup_event: returns [] on failure, never raises.
+    """
+    try:
+        rows = [
+            AuditEvent(
+                tenant_id=e.get("tenant_id"),
+                user_email=e.get("user_email"),
+                category=e["category"],
+                action=e["action"],
+                payload_json=_safe_json(e.get("payload") or {}),
+                ok=e.get("ok", True),
+                error=e.get("error"),
+            )
+            for e in events
+        ]
+        ids = [r.id for r in rows]
+        session.add_all(rows)
+        session.commit()
+        return ids
+    except Exception:
+        try:
+            session.rollback()
+        except Exception:
+            pass
+        return []
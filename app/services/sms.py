@@ -1,18 +1,32 @@
 # app/services/sms.py
 import os
-from typing import Optional, Dict, Any
-from datetime import datetime
-from zoneinfo import ZoneInfo
-from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
-from datetime import timezone
+import threading
+import time
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Optional, Dict, Any, List, Tuple
+from datetime import datetime, timezone
 from zoneinfo import ZoneInfo
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode, quote_plus
 
+from requests.adapters import HTTPAdapter
 from sqlmodel import select
 
 from app.db import get_session
 from app.models import Tenant, TenantSettings
 from app import config
-from twilio.rest import Client
+
+if TYPE_CHECKING:
+    from twilio.rest import Client
+
+
+@lru_cache(maxsize=1)
+def _parsed_booking_link(base: str) -> Tuple[str, Dict[str, str], str]:
+    """Split BOOKING_LINK once into (url before '?', query dict, '#fragment')."""
+    parts = urlsplit(base)
+    head = urlunsplit((parts.scheme, parts.netloc, parts.path, "", ""))
+    tail = f"#{parts.fragment}" if parts.fragment else ""
+    return head, dict(parse_qsl(parts.query)), tail
 
 
 def _booking_link_for_slug(tenant_slug: str) -> Optional[str]:
@@ -28,15 +42,44 @@ def _booking_link_for_slug(tenant_slug: str) -> Optional[str]:
     if not base:
         return None
 
-    parts = urlsplit(base)
-    query = dict(parse_qsl(parts.query))
+    head, base_query, tail = _parsed_booking_link(base)
+    if not base_query or base_query.keys() == {"tenant"}:
+        return f"{head}?tenant={quote_plus(tenant_slug)}{tail}"
+
+    query = dict(base_query)
     query["tenant"] = tenant_slug  # always force to this tenant
+    return f"{head}?{urlencode(query)}{tail}"
+
 
-    new_query = urlencode(query)
-    return urlunsplit((parts.scheme, parts.netloc, parts.path, new_query, parts.fragment))
+# Brand lookups are hit several times per webhook; keep them for a few seconds.
+_BRAND_TTL_SECONDS = 30.0
+_BRAND_CACHE: Dict[str, tuple] = {}  # slug -> (expires_at, brand dict)
 
 
 def get_brand_for_tenant(tenant_slug: str) -> dict:
+    """
+    Cached wrapper around _load_brand (short TTL; see invalidate_brand).
+    Returns a fresh dict so callers can't mutate the cached copy.
+    """
+    now = time.monotonic()
+    hit = _BRAND_CACHE.get(tenant_slug)
+    if hit and hit[0] > now:
+        return dict(hit[1])
+
+    brand = _load_brand(tenant_slug)
+    _BRAND_CACHE[tenant_slug] = (now + _BRAND_TTL_SECONDS, brand)
+    return dict(brand)
+
+
+def invalidate_brand(tenant_slug: Optional[str] = None) -> None:
+    """Drop the cached brand for one tenant (or all tenants) after a settings write."""
+    if tenant_slug is None:
+        _BRAND_CACHE.clear()
+    else:
+        _BRAND_CACHE.pop(tenant_slug, None)
+
+
+def _load_brand(tenant_slug: str) -> dict:
     """
     Source of truth for branding / review data.
 
@@ -49,10 +92,13 @@ def get_brand_for_tenant(tenant_slug: str) -> dict:
     gen = get_session()
     session = next(gen)
     try:
-        # 1) find the tenant row by slug
-        tenant = session.exec(
-            select(Tenant).where(Tenant.slug == tenant_slug)
+        # tenant row by slug + its settings row (string FK on slug), one roundtrip
+        row = session.exec(
+            select(Tenant, TenantSettings)
+            .join(TenantSettings, TenantSettings.tenant_id == Tenant.slug, isouter=True)
+            .where(Tenant.slug == tenant_slug)
         ).first()
+        tenant, settings = row if row else (None, None)
 
         if not tenant:
 
@@ -67,11 +113,6 @@ def get_brand_for_tenant(tenant_slug: str) -> dict:
 
             }
 
-        # 2) find settings row by tenant.slug (string FK)
-        settings = session.exec(
-            select(TenantSettings).where(TenantSettings.tenant_id == tenant.slug)
-        ).first()
-
         # Settings override tenant where present; else fall back to tenant fields
         business_name = (
             (settings.business_name or "").strip()
@@ -129,24 +170,70 @@ def get_brand_for_tenant(tenant_slug: str) -> dict:
         session.close()
 
 
+# ---------- SMS blocklist ----------
+
+def _parse_blocklist(raw: str) -> frozenset:
+    return frozenset(x.strip() for x in (raw or "").split(",") if x.strip())
+
+
+_BLOCKLIST = _parse_blocklist(getattr(config, "SMS_BLOCKLIST", "") or "")
+
+
+def reload_blocklist() -> None:
+    """Re-read config.SMS_BLOCKLIST (only needed if it changes at runtime)."""
+    global _BLOCKLIST
+    _BLOCKLIST = _parse_blocklist(getattr(config, "SMS_BLOCKLIST", "") or "")
+
+
+def is_blocked_number(phone: str) -> bool:
+    return phone in _BLOCKLIST
+
+
 def _truthy(val) -> bool:
     return str(val).strip().lower() in ("1", "true", "yes", "y", "on")
 
 
-def is_dry_run() -> bool:
-    # Prefer live env each call; fall back to config attr; default false
+# Env is re-read at most every few seconds; bulk sends hit this once per message.
+_DRY_RUN_TTL_SECONDS = 5.0
+_DRY_RUN_CACHE: Optional[tuple] = None  # (expires_at, value)
+
+
+def _read_dry_run() -> bool:
+    # Prefer live env; fall back to config attr; default false
     env_val = os.getenv("SMS_DRY_RUN", None)
     if env_val is not None:
         return _truthy(env_val)
     return _truthy(getattr(config, "SMS_DRY_RUN", "false"))
 
 
-def _client() -> Client:
+def is_dry_run() -> bool:
+    global _DRY_RUN_CACHE
+    now = time.monotonic()
+    cached = _DRY_RUN_CACHE
+    if cached is not None and cached[0] > now:
+        return cached[1]
+    value = _read_dry_run()
+    _DRY_RUN_CACHE = (now + _DRY_RUN_TTL_SECONDS, value)
+    return value
+
+
+# One Twilio client per credential set so sends share its keep-alive pool.
+_CLIENT: Optional["Client"] = None
+_CLIENT_CREDS: Optional[tuple] = None
+_CLIENT_LOCK = threading.Lock()
+
+
+def _client() -> "Client":
     """
-    Build a Twilio client using API Key auth:
+    Return a cached Twilio client using API Key auth:
 
       Client(api_key_sid, api_key_secret, account_sid)
+
+    Rebuilt only when the credentials change. twilio.rest is imported on
+    first use so app startup doesn't pay for the full REST SDK.
     """
+    global _CLIENT, _CLIENT_CREDS
+
     api_key = os.getenv("TWILIO_API_KEY", getattr(config, "TWILIO_API_KEY", ""))
     secret = os.getenv("TWILIO_AUTH_TOKEN", getattr(config, "TWILIO_AUTH_TOKEN", ""))
     account = os.getenv("TWILIO_ACCOUNT_SID", getattr(config, "TWILIO_ACCOUNT_SID", ""))
@@ -154,7 +241,24 @@ def _client() -> Client:
     if not (api_key and secret and account):
         raise RuntimeError("Missing TWILIO_API_KEY / TWILIO_AUTH_TOKEN / TWILIO_ACCOUNT_SID")
 
-    return Client(api_key, secret, account)
+    creds = (api_key, secret, account)
+    if _CLIENT is not None and _CLIENT_CREDS == creds:
+        return _CLIENT
+
+    with _CLIENT_LOCK:
+        if _CLIENT is None or _CLIENT_CREDS != creds:
+            from twilio.rest import Client
+
+            client = Client(api_key, secret, account)
+            session = getattr(client.http_client, "session", None)
+            if session is not None:
+                session.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=20))
+            _CLIENT, _CLIENT_CREDS = client, creds
+        return _CLIENT
+
+
+# str.translate table that deletes every non-digit ASCII character.
+_KEEP_DIGITS = str.maketrans("", "", "".join(chr(c) for c in range(128) if not chr(c).isdigit()))
 
 
 def _normalize_phone(phone: Optional[str]) -> Optional[str]:
@@ -173,7 +277,10 @@ def _normalize_phone(phone: Optional[str]) -> Optional[str]:
     if p.startswith("+"):
         return p
 
-    digits = "".join(ch for ch in p if ch.isdigit())
+    if p.isascii():
+        digits = p.translate(_KEEP_DIGITS)
+    else:
+        digits = "".join(ch for ch in p if ch.isdigit())
     if len(digits) == 10:
         return "+1" + digits
     if len(digits) == 11 and digits.startswith("1"):
@@ -246,23 +353,64 @@ def send_sms(to: str, body: str) -> bool:
         return False
 
 
+_BATCH_WORKERS = 10
+
+
+def send_sms_batch(messages: List[Tuple[str, str]]) -> List[bool]:
+    """
+    Send many (to, body) pairs concurrently through the shared Twilio client.
+    Twilio has no bulk endpoint, so this is pooled keep-alive + threads.
+    Returns one bool per message, in order (same semantics as send_sms).
+    """
+    if not messages:
+        return []
+    if len(messages) == 1:
+        return [send_sms(*messages[0])]
+
+    with ThreadPoolExecutor(max_workers=min(_BATCH_WORKERS, len(messages))) as pool:
+        return list(pool.map(lambda m: send_sms(m[0], m[1]), messages))
+
+
 # ---------- time formatting helper (shared by confirmation / reminders / office) ----------
 
+def _pretty_tz_name() -> str:
+    tz_name = getattr(config, "TZ", None)
+    if not tz_name and hasattr(config, "settings"):
+        tz_name = getattr(config.settings, "TZ", "America/New_York")
+    return tz_name or "America/New_York"
+
+
+_PRETTY_TZ = ZoneInfo(_pretty_tz_name())
+
+# "current year" only matters for dropping the year; re-check it hourly.
+_YEAR_TTL_SECONDS = 3600.0
+_year_cache: tuple = (0.0, 0)  # (expires_at, year)
+
+
+def _current_year() -> int:
+    global _year_cache
+    now = time.monotonic()
+    if _year_cache[0] <= now:
+        _year_cache = (now + _YEAR_TTL_SECONDS, datetime.now(_PRETTY_TZ).year)
+    return _year_cache[1]
+
+
 def format_pretty_time(iso_str: str) -> str:
     """
     Convert ISO string to something like:
       12/5 2:00 PM
     (no year if it's the current year; we default to config.TZ or America/New_York)
     """
-    try:
-        # figure out TZ
-        tz_name = getattr(config, "TZ", None)
-        if not tz_name and hasattr(config, "settings"):
-            tz_name = getattr(config.settings, "TZ", "America/New_York")
-        tz_name = tz_name or "America/New_York"
+    return _format_pretty_time(str(iso_str), _current_year())
 
-        dt = datetime.fromisoformat(str(iso_str).replace("Z", "+00:00")).astimezone(ZoneInfo(tz_name))
-        now_year = datetime.now(ZoneInfo(tz_name)).year
+
+@lru_cache(maxsize=1024)
+def _format_pretty_time(iso_str: str, now_year: int) -> str:
+    try:
+        dt = datetime.fromisoformat(iso_str.replace("Z", "+00:00"))
+        # local ISO already in the display zone: skip the conversion
+        if dt.tzinfo is None or dt.utcoffset() != _PRETTY_TZ.utcoffset(dt.replace(tzinfo=None)):
+            dt = dt.astimezone(_PRETTY_TZ)
 
         if dt.year == now_year:
             s = dt.strftime("%m/%d %I:%M %p")
@@ -273,7 +421,7 @@ def format_pretty_time(iso_str: str) -> str:
         s = s.replace("/0", "/").replace(" 0", " ")
         return s
     except Exception:
-        return str(iso_str)
+        return iso_str
 
 
 # ---- Booking-specific helpers ----
@@ -331,6 +479,32 @@ def _booking_reminder_sms_inner(tenant_id: str, payload: dict, kind: str) -> boo
         return False
 
     brand = get_brand_for_tenant(tenant_id)
+    return send_sms(phone, _booking_reminder_body(tenant_id, brand, payload, kind))
+
+
+# Reminder SMS bodies by kind; filled with str.format_map in _booking_reminder_body.
+_REMINDER_SMS_TEMPLATES = {
+    "24h": (
+        "Hi {name}, just a reminder of your {service} with {from_name} "
+        "tomorrow ({when}). Reply C to cancel or R to reschedule."
+    ),
+    "2h": (
+        "Hi {name}, friendly reminder of your {service} with {from_name} "
+        "in about 2 hours ({when}). Reply C to cancel or R to reschedule."
+    ),
+    "review": (
+        "Hi {name}, thanks again for choosing {from_name}! "
+        "If we earned it, would you mind leaving a quick review here: {review_link}"
+    ),
+    "review_nolink": (
+        "Hi {name}, thanks again for choosing {from_name}! "
+        "We’d really appreciate a quick review if you have a moment."
+    ),
+}
+_REMINDER_SMS_FALLBACK = "Reminder from {from_name} about your appointment."
+
+
+def _booking_reminder_body(tenant_id: str, brand: dict, payload: dict, kind: str) -> str:
     from_name = brand.get("business_name") or tenant_id
     review_link_default = brand.get("review_link") or None
 
@@ -345,31 +519,47 @@ def _booking_reminder_sms_inner(tenant_id: str, payload: dict, kind: str) -> boo
     if starts_iso:
         when = format_pretty_time(str(starts_iso))
 
-    if kind == "24h":
-        body = (
-            f"Hi {name}, just a reminder of your {service} with {from_name} "
-            f"tomorrow ({when}). Reply C to cancel or R to reschedule."
-        )
-    elif kind == "2h":
-        body = (
-            f"Hi {name}, friendly reminder of your {service} with {from_name} "
-            f"in about 2 hours ({when}). Reply C to cancel or R to reschedule."
-        )
-    elif kind == "review":
-        if review_link:
-            body = (
-                f"Hi {name}, thanks again for choosing {from_name}! "
-                f"If we earned it, would you mind leaving a quick review here: {review_link}"
-            )
-        else:
-            body = (
-                f"Hi {name}, thanks again for choosing {from_name}! "
-                f"We’d really appreciate a quick review if you have a moment."
-            )
-    else:
-        body = f"Reminder from {from_name} about your appointment."
+    if kind == "review" and not review_link:
+        kind = "review_nolink"
+    template = _REMINDER_SMS_TEMPLATES.get(kind, _REMINDER_SMS_FALLBACK)
+    return template.format_map({
+        "name": name,
+        "service": service,
+        "from_name": from_name,
+        "when": when,
+        "review_link": review_link,
+    })
 
-    return send_sms(phone, body)
+
+def booking_reminder_sms_batch(tenant_id: str, payloads: List[dict], kind: str) -> List[bool]:
+    """
+    Same as booking_reminder_sms for many bookings of one tenant:
+    one brand lookup, then the sends go out concurrently via send_sms_batch.
+    Results line up with `payloads`; payloads without a phone are False.
+    """
+    results = [False] * len(payloads)
+    try:
+        brand = get_brand_for_tenant(tenant_id)
+    except Exception as exc:
+        print(f"[REMINDER SMS ERROR] kind={kind!r} tenant={tenant_id!r} err={exc!r}", flush=True)
+        return results
+    messages: List[Tuple[str, str]] = []
+    slots: List[int] = []
+    for i, payload in enumerate(payloads):
+        phone = payload.get("phone")
+        if not phone:
+            continue
+        try:
+            body = _booking_reminder_body(tenant_id, brand, payload, kind)
+        except Exception as exc:
+            print(f"[REMINDER SMS ERROR] kind={kind!r} tenant={tenant_id!r} err={exc!r}", flush=True)
+            continue
+        messages.append((phone, body))
+        slots.append(i)
+
+    for i, ok in zip(slots, send_sms_batch(messages)):
+        results[i] = ok
+    return results
 
 
 def owner_alert_sms(tenant_id: str, payload: dict) -> bool:
@@ -464,67 +654,68 @@ def lead_auto_reply_sms(tenant_id: str, payload: dict) -> bool:
 OFFICE_SMS_TO = os.getenv("OFFICE_SMS_TO", "").strip()
 
 
-def _office_destination_for_tenant(tenant_id: str) -> Optional[str]:
+def _office_destination_for_tenant(tenant_id: str, brand: Optional[dict] = None) -> Optional[str]:
     """
     Determine where to send owner / office notifications.
+    Pass `brand` when the caller already fetched it.
 
     Priority:
       1. TenantSettings.office_sms_to
       2. Global OFFICE_SMS_TO env
     """
-    brand = get_brand_for_tenant(tenant_id)
+    if brand is None:
+        brand = get_brand_for_tenant(tenant_id)
     if brand.get("office_sms_to"):
         return brand["office_sms_to"]
     return OFFICE_SMS_TO or None
 
 
+_MESSAGE_KEYS = ("message", "note", "notes", "detail", "description")
+_CONTACT_KEYS = frozenset(("name", "phone", "email"))
+
+
+def _lead_message(payload: dict) -> str:
+    """
+    The lead's message for office copies: the first known message key, else
+    "key: value" for every other non-empty field, joined with '; '.
+    """
+    for key in _MESSAGE_KEYS:
+        value = payload.get(key)
+        if value:
+            text_val = str(value).strip()
+            if text_val:
+                return text_val
+            break
+
+    parts = []
+    for key, value in payload.items():
+        if key in _CONTACT_KEYS or value is None:
+            continue
+        text_val = str(value).strip()
+        if text_val:
+            parts.append(f"{key}: {text_val}")
+    return "; ".join(parts)
+
+
 def lead_office_notify_sms(tenant_id: str, payload: dict) -> bool:
     """
     SMS to the BUSINESS OWNER when a new lead comes in.
 
     Uses per-tenant office_sms_to if set, else global OFFICE_SMS_TO.
     """
-    office_to = _office_destination_for_tenant(tenant_id)
+    brand = get_brand_for_tenant(tenant_id)
+    office_to = _office_destination_for_tenant(tenant_id, brand)
     if not office_to:
         print("[lead_office_notify_sms] No office SMS destination; skipping owner SMS")
         return False
 
-    brand = get_brand_for_tenant(tenant_id)
     from_name = brand.get("business_name") or tenant_id
 
     name = (payload.get("name") or "").strip() or "Unknown"
     phone = payload.get("phone") or "N/A"
     email = (payload.get("email") or "").strip() or "N/A"
 
-    # 1) Try known keys for the message
-    raw_message = (
-        payload.get("message")
-        or payload.get("note")
-        or payload.get("notes")
-        or payload.get("detail")
-        or payload.get("description")
-        or ""
-    )
-    raw_message = (raw_message or "").strip()
-
-    # 2) If still empty, build a message from "all other fields"
-    if not raw_message:
-        extra_parts = []
-        for key, value in payload.items():
-            if key in ("name", "phone", "email"):
-                continue
-            if value is None:
-                continue
-            text_val = str(value).strip()
-            if not text_val:
-                continue
-            extra_parts.append(f"{key}: {text_val}")
-
-        if extra_parts:
-            raw_message = "; ".join(extra_parts)
-
-    # 3) Final fallback
-    message = raw_message or "(no message)"
+    message = _lead_message(payload) or "(no message)"
 
     lines = [
         f"New lead for {from_name}:",
@@ -543,12 +734,12 @@ def vapi_lead_office_sms(tenant_id: str, payload: dict) -> bool:
     SMS to the office when a new Vapi AI call lead comes in.
     payload fields: name, phone, issue, zip
     """
-    office_to = _office_destination_for_tenant(tenant_id)
+    brand = get_brand_for_tenant(tenant_id)
+    office_to = _office_destination_for_tenant(tenant_id, brand)
     if not office_to:
         print("[vapi_lead_office_sms] No office SMS destination; skipping.")
         return False
 
-    brand = get_brand_for_tenant(tenant_id)
     business_name = brand.get("business_name") or tenant_id
 
     name = (payload.get("name") or "").strip()
@@ -618,12 +809,12 @@ def booking_office_notify_sms(tenant_id: str, payload: dict) -> bool:
     Notify the office when a new booking is created.
     Uses per-tenant office_sms_to if set, else global OFFICE_SMS_TO.
     """
-    office_to = _office_destination_for_tenant(tenant_id)
+    brand = get_brand_for_tenant(tenant_id)
+    office_to = _office_destination_for_tenant(tenant_id, brand)
     if not office_to:
         print("[SMS] No office SMS destination; skipping office notify for booking.")
         return False
 
-    brand = get_brand_for_tenant(tenant_id)
     from_name = brand.get("business_name") or tenant_id
 
     name = (payload.get("name") or "").strip() or "Unknown"
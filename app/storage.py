@@ -1,9 +1,17 @@
 # app/storage.py
 from __future__ import annotations
 
+import atexit
 import csv
+import io
 import json
-import uuid
+import os
+import queue
+import re
+import secrets
+import threading
+import time
+from functools import lru_cache
 from pathlib import Path
 from datetime import datetime, timedelta, timezone
 from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
@@ -63,15 +71,50 @@ def _tz():
         return timezone.utc
 
 
+_TZ = _tz()  # resolved once; config.TZ doesn't change at runtime
+
+
+def _new_id() -> str:
+    """Row id for the CSV logs: 16 hex chars (64 random bits); nothing looks rows up by id."""
+    return secrets.token_hex(8)
+
+
 def _now_iso() -> str:
-    prefix = datetime.now(timezone.utc).astimezone(ZoneInfo("America/New_York")).strftime("%m/%d %H:%M")
+    """Current time as UTC ISO to the second, e.g. 2025-01-31T14:05:00Z."""
+    return datetime.now(timezone.utc).isoformat(timespec="seconds").replace("+00:00", "Z")
 
 
+# What _now_iso() and isoformat(timespec="seconds") produce; anything else
+# falls back to fromisoformat.
+_ISO_RE = re.compile(
+    r"(\d{4})-(\d{2})-(\d{2})T(\d{2}):(\d{2}):(\d{2})(?:(Z)|([+-])(\d{2}):(\d{2}))?",
+    re.ASCII,
+)
+
+
+@lru_cache(maxsize=64)
+def _offset_tz(sign: str, hh: str, mm: str) -> timezone:
+    delta = timedelta(hours=int(hh), minutes=int(mm))
+    return timezone(-delta if sign == "-" else delta)
+
 
 def _parse_dt(s: str | None):
     """Parse ISO string to datetime; return None if invalid."""
     if not s:
         return None
+    m = _ISO_RE.fullmatch(s)
+    if m is not None:
+        y, mo, d, h, mi, sec, z, sign, oh, om = m.groups()
+        try:
+            if z:
+                tz = timezone.utc
+            elif sign:
+                tz = _offset_tz(sign, oh, om)
+            else:
+                tz = None
+            return datetime(int(y), int(mo), int(d), int(h), int(mi), int(sec), tzinfo=tz)
+        except ValueError:
+            return None
     try:
         # Handle trailing Z
         if s.endswith("Z"):
@@ -82,6 +125,212 @@ def _parse_dt(s: str | None):
         return None
 
 
+class _CsvAppender:
+    """
+    One long-lived append handle per CSV file. The header is written only by
+    the worker that creates the file; each batch is flushed as soon as it is written.
+    """
+
+    def __init__(self, path: Path, fields: list[str]):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.fields = fields
+        self.lock = threading.Lock()
+        # O_CREAT|O_EXCL: when several workers start on a missing file, only
+        # the one that creates it writes the header. Everyone else trusts it,
+        # even if the file still looks empty (creator not done yet) — checking
+        # the size here would bring back the duplicate-header race.
+        try:
+            with path.open("x", newline="", encoding="utf-8") as f:
+                csv.writer(f).writerow(fields)
+        except FileExistsError:
+            pass
+        self.f = path.open("a", buffering=65536, newline="", encoding="utf-8")
+        self.writer = csv.writer(self.f)
+
+    def write_many(self, rows: list[list]) -> None:
+        with self.lock:
+            self.writer.writerows(rows)
+            self.f.flush()
+
+    def close(self) -> None:
+        with self.lock:
+            if not self.f.closed:
+                self.f.close()
+
+
+_APPENDERS: dict[Path, _CsvAppender] = {}
+_APPENDERS_LOCK = threading.Lock()
+
+
+def _get_appender(path: Path, fields: list[str]) -> _CsvAppender:
+    appender = _APPENDERS.get(path)
+    if appender is None:
+        with _APPENDERS_LOCK:
+            appender = _APPENDERS.get(path)
+            if appender is None:
+                appender = _APPENDERS[path] = _CsvAppender(path, fields)
+    return appender
+
+
+# CSV rows are written by one background thread so request handlers never wait
+# on disk. Rows are batched per file: flushed every _WRITE_BATCH rows or
+# _WRITE_LINGER seconds, whichever comes first. In-memory indexes
+# (_RECENT_SENDS, _SENT_KEYS) are updated by the caller, not here.
+_WRITE_BATCH = 100
+_WRITE_LINGER = 0.1
+_WRITE_QUEUE: "queue.Queue[tuple[Path, list[str], list] | None]" = queue.Queue()
+_WRITER: threading.Thread | None = None
+_WRITER_LOCK = threading.Lock()
+
+
+def _write_batch(batch: list[tuple[Path, list[str], list]]) -> None:
+    by_path: dict[Path, tuple[list[str], list[list]]] = {}
+    for path, fields, row in batch:
+        by_path.setdefault(path, (fields, []))[1].append(row)
+    for path, (fields, rows) in by_path.items():
+        try:
+            _get_appender(path, fields).write_many(rows)
+        except Exception as e:
+            print(f"[STORAGE ERROR] csv write to {path} failed: {e}")
+
+
+def _writer_loop() -> None:
+    while True:
+        item = _WRITE_QUEUE.get()
+        batch, done = [], item is None
+        if not done:
+            batch.append(item)
+            deadline = time.monotonic() + _WRITE_LINGER
+            while len(batch) < _WRITE_BATCH:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = _WRITE_QUEUE.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    done = True
+                    break
+                batch.append(item)
+        if batch:
+            _write_batch(batch)
+        for _ in range(len(batch) + done):
+            _WRITE_QUEUE.task_done()
+        if done:
+            return
+
+
+def _enqueue_row(path: Path, fields: list[str], row: list) -> None:
+    global _WRITER
+    if _WRITER is None:
+        with _WRITER_LOCK:
+            if _WRITER is None:
+                _WRITER = threading.Thread(target=_writer_loop, name="csv-writer", daemon=True)
+                _WRITER.start()
+                atexit.register(_drain_writes)
+    _WRITE_QUEUE.put((path, fields, row))
+
+
+def flush_writes() -> None:
+    """Block until every queued CSV row has been written."""
+    if _WRITER is not None:
+        _WRITE_QUEUE.join()
+
+
+def _drain_writes() -> None:
+    # registered after _close_appenders, so atexit runs it first
+    if _WRITER is not None and _WRITER.is_alive():
+        _WRITE_QUEUE.put(None)
+        _WRITER.join(timeout=5)
+
+
+@atexit.register
+def _close_appenders() -> None:
+    for appender in list(_APPENDERS.values()):
+        try:
+            appender.close()
+        except Exception:
+            pass
+
+
+def _iter_records_reversed(path: Path, block: int = 65536):
+    """
+    Yield the raw bytes of each CSV record after the header, newest first,
+    reading the file backwards in `block`-sized chunks.
+
+    Quoted fields may contain newlines. A newline ends a record only when
+    the bytes after it (to EOF) hold an even number of quote characters:
+    EOF is outside any quotes, so that parity tells us which side we're on.
+    """
+    with path.open("rb") as f:
+        pos = f.seek(0, os.SEEK_END)
+        pending = b""
+        while pos > 0:
+            step = min(block, pos)
+            pos -= step
+            f.seek(pos)
+            pending = f.read(step) + pending
+
+            end = len(pending)
+            idx = end
+            while True:
+                nl = pending.rfind(b"\n", 0, idx)
+                if nl < 0:
+                    break
+                record = pending[nl + 1:end]
+                if record.count(b'"') % 2 == 0:
+                    record = record.rstrip(b"\r")
+                    if record:
+                        yield record
+                    end = nl
+                idx = nl
+            pending = pending[:end]
+        # whatever is left at offset 0 is the header
+
+
+def _read_latest(path: Path, limit: int) -> list[dict]:
+    """Last `limit` rows of a CSV as dicts (most recent first); only those rows are parsed."""
+    if limit <= 0:
+        return []
+    try:
+        st = path.stat()
+    except OSError:
+        return []
+    # dashboards poll these; reuse the parse until the file changes
+    rows = _read_latest_cached(str(path), st.st_mtime_ns, st.st_size, limit)
+    return [dict(r) for r in rows]
+
+
+_POOLED_COLUMNS = frozenset(("source", "sms_sent", "timezone", "offset"))
+
+
+@lru_cache(maxsize=16)
+def _read_latest_cached(path_str: str, mtime_ns: int, size: int, limit: int) -> tuple[dict, ...]:
+    path = Path(path_str)
+    with path.open("r", newline="", encoding="utf-8") as f:
+        header = next(csv.reader(f), None)
+    if not header:
+        return ()
+
+    # low-cardinality columns share one str per distinct value
+    pooled = [i for i, name in enumerate(header) if name in _POOLED_COLUMNS]
+    pool: dict[str, str] = {}
+
+    out = []
+    for record in _iter_records_reversed(path):
+        row = next(csv.reader([record.decode("utf-8", errors="replace")]), None)
+        if row:
+            for i in pooled:
+                if i < len(row):
+                    row[i] = pool.setdefault(row[i], row[i])
+            out.append(dict(zip(header, row)))
+            if len(out) >= limit:
+                break
+    return tuple(out)
+
+
 # --------------------------------------------------------------------------------------
 # Leads CSV
 # --------------------------------------------------------------------------------------
@@ -90,88 +339,132 @@ def save_lead(lead: dict, sms_body: str, sms_sent: bool, source: str = "api"):
     """
     Append one lead to the CSV, creating the header if it's a new file.
     """
-    CSV_PATH.parent.mkdir(parents=True, exist_ok=True)
-    new_file = not CSV_PATH.exists() or CSV_PATH.stat().st_size == 0
-
-    row = {
-        "lead_id": str(uuid.uuid4()),
-        "created_at": _now_iso(),
-        "source": source,
-        "name": lead.get("name") or "",
-        "phone": lead.get("phone") or "",
-        "email": lead.get("email") or "",
-        "message": lead.get("message") or "",
-        "sms_body": sms_body,
-        "sms_sent": "true" if sms_sent else "false",
-    }
-
-    with CSV_PATH.open("a", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=FIELDS)
-        if new_file:
-            writer.writeheader()
-        writer.writerow(row)
+    phone = lead.get("phone") or ""
+    row = [  # FIELDS order
+        _new_id(),
+        _now_iso(),
+        source,
+        lead.get("name") or "",
+        phone,
+        lead.get("email") or "",
+        lead.get("message") or "",
+        sms_body,
+        "true" if sms_sent else "false",
+    ]
+
+    if sms_sent:
+        with _RECENT_LOCK:
+            _note_recent_send(phone, time.time())
+
+    _enqueue_row(CSV_PATH, FIELDS, row)
 
 
 def read_leads(limit: int = 20) -> list[dict]:
     """
     Return the last N leads (most recent first).
     """
-    if not CSV_PATH.exists():
-        return []
-    with CSV_PATH.open("r", newline="", encoding="utf-8") as f:
-        rows = list(csv.DictReader(f))
-    return list(reversed(rows))[:max(0, limit)]
+    return _read_latest(CSV_PATH, limit)
 
 
-def sent_recently(phone: str, minutes: int = 120) -> bool:
+class _CsvTail:
     """
-    True if we've sent an SMS to this phone within the last `minutes`.
-    Checks rows with sms_sent == 'true'.
-
-    FIX: make both `dt` and `now` timezone-aware even on Windows without tzdata.
+    Incremental reader for an append-only CSV: remembers the byte offset and
+    header so each call parses only rows appended since the last one.
     """
-    if not CSV_PATH.exists():
-        return False
 
-    try:
-        with CSV_PATH.open("r", newline="", encoding="utf-8") as f:
-            rows = list(csv.DictReader(f))
-    except Exception:
-        return False
+    def __init__(self):
+        self.path: Path | None = None
+        self.pos = 0
+        self.cols: dict[str, int] = {}
 
-    # choose a default tz for "now"
-    default_tz = _tz()
-    for row in reversed(rows):  # newest first
-        if (row.get("phone") or "").strip() != phone.strip():
-            continue
-        if (row.get("sms_sent") or "").lower() != "true":
+    def read_new(self, path: Path, fields: list[str]) -> tuple[bool, list[list[str]]]:
+        """Return (reset, rows). `reset` means the file was replaced/truncated: rebuild from scratch."""
+        reset = False
+        try:
+            size = path.stat().st_size
+        except OSError:
+            return False, []
+        if path != self.path or size < self.pos:
+            reset = self.path is not None
+            self.path, self.pos, self.cols = path, 0, {}
+        if size == self.pos:
+            return reset, []
+
+        with path.open("rb") as f:
+            f.seek(self.pos)
+            chunk = f.read(size - self.pos)
+
+        # only consume complete lines; a half-written row is picked up next time
+        cut = chunk.rfind(b"\n") + 1
+        if not cut:
+            return reset, []
+        self.pos += cut
+
+        rows = csv.reader(io.StringIO(chunk[:cut].decode("utf-8", errors="replace"), newline=""))
+        if not self.cols:
+            header = next(rows, None) or fields
+            self.cols = {name: i for i, name in enumerate(header)}
+        return reset, list(rows)
+
+
+# In-memory index over the leads CSV: phone -> newest created_at (UTC epoch seconds)
+# among rows with sms_sent == 'true'.
+# Built by streaming the file once, then only rows appended since the last call
+# are parsed. save_lead() writes into it directly.
+_RECENT_SENDS: dict[str, float] = {}
+_LEADS_TAIL = _CsvTail()
+_RECENT_LOCK = threading.Lock()
+
+
+def _note_recent_send(phone: str, ts: float) -> None:
+    phone = (phone or "").strip()
+    if not phone:
+        return
+    prev = _RECENT_SENDS.get(phone)
+    if prev is None or ts > prev:
+        _RECENT_SENDS[phone] = ts
+
+
+def _refresh_recent_sends() -> None:
+    """Ingest rows appended to CSV_PATH since the last call (caller holds _RECENT_LOCK)."""
+    reset, rows = _LEADS_TAIL.read_new(CSV_PATH, FIELDS)
+    if reset:
+        _RECENT_SENDS.clear()
+
+    cols = _LEADS_TAIL.cols
+    i_phone = cols.get("phone")
+    i_sent = cols.get("sms_sent")
+    i_created = cols.get("created_at")
+    if i_phone is None or i_sent is None or i_created is None:
+        return
+    width = max(i_phone, i_sent, i_created)
+
+    for row in rows:
+        if len(row) <= width or row[i_sent].lower() != "true":
             continue
-
-        dt = _parse_dt(row.get("created_at", ""))
+        dt = _parse_dt(row[i_created])
         if dt is None:
             continue
-
-        # ensure dt is tz-aware
         if dt.tzinfo is None:
-            # try configured TZ; if that fails, assume UTC
-            tz = _tz()
-            dt = dt.replace(tzinfo=tz)
-
-        # compute now using the same tz as dt to avoid naive/aware issues
-        now = prefix = datetime.now(timezone.utc).astimezone(ZoneInfo("America/New_York")).strftime("%m/%d %H:%M")
+            dt = dt.replace(tzinfo=_TZ)
+        _note_recent_send(row[i_phone], dt.timestamp())
 
 
+def sent_recently(phone: str, minutes: int = 120) -> bool:
+    """
+    True if we've sent an SMS to this phone within the last `minutes`.
+    Checks rows with sms_sent == 'true' (via the in-memory index above).
+    """
+    with _RECENT_LOCK:
         try:
-            if (now - dt) <= timedelta(minutes=minutes):
-                return True
+            _refresh_recent_sends()
         except Exception:
-            # if anything odd, fall back to UTC baseline
-            now_utc = datetime.now(timezone.utc)
-            dt_utc = dt.astimezone(timezone.utc)
-            if (now_utc - dt_utc) <= timedelta(minutes=minutes):
-                return True
+            pass
+        last = _RECENT_SENDS.get((phone or "").strip())
 
-    return False
+    if last is None:
+        return False
+    return time.time() - last <= minutes * 60
 
 
 # --------------------------------------------------------------------------------------
@@ -190,35 +483,25 @@ def save_booking(
     sms_sent: bool,
     source: str = "calendly",
 ):
-    new_file = not CSV_BOOKINGS.exists() or CSV_BOOKINGS.stat().st_size == 0
-    row = {
-        "booking_id": str(uuid.uuid4()),
-        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds").replace("+00:00", "Z"),
-
-        "source": source,
-        "event_id": event_id or "",
-        "invitee_name": invitee_name or "",
-        "invitee_email": invitee_email or "",
-        "invitee_phone": invitee_phone or "",
-        "start_time": start_time or "",
-        "end_time": end_time or "",
-        "timezone": tz_str or "",
-        "notes": notes or "",
-        "sms_sent": "true" if sms_sent else "false",
-    }
-    with CSV_BOOKINGS.open("a", newline="", encoding="utf-8") as f:
-        w = csv.DictWriter(f, fieldnames=BOOKING_FIELDS)
-        if new_file:
-            w.writeheader()
-        w.writerow(row)
+    row = [  # BOOKING_FIELDS order
+        _new_id(),
+        _now_iso(),
+        source,
+        event_id or "",
+        invitee_name or "",
+        invitee_email or "",
+        invitee_phone or "",
+        start_time or "",
+        end_time or "",
+        tz_str or "",
+        notes or "",
+        "true" if sms_sent else "false",
+    ]
+    _enqueue_row(CSV_BOOKINGS, BOOKING_FIELDS, row)
 
 
 def read_bookings(limit: int = 20) -> list[dict]:
-    if not CSV_BOOKINGS.exists():
-        return []
-    with CSV_BOOKINGS.open("r", newline="", encoding="utf-8") as f:
-        rows = list(csv.DictReader(f))
-    return list(reversed(rows))[:max(0, limit)]
+    return _read_latest(CSV_BOOKINGS, limit)
 
 
 # --------------------------------------------------------------------------------------
@@ -226,81 +509,73 @@ def read_bookings(limit: int = 20) -> list[dict]:
 # --------------------------------------------------------------------------------------
 
 def save_review_request(data: dict, sms_body: str, sms_sent: bool, source: str = "api"):
-    REVIEWS_CSV_PATH.parent.mkdir(parents=True, exist_ok=True)
-    new_file = not REVIEWS_CSV_PATH.exists() or REVIEWS_CSV_PATH.stat().st_size == 0
-    row = {
-        "request_id": str(uuid.uuid4()),
-        "created_at": _now_iso(),
-        "source": source,
-        "job_id": data.get("job_id") or "",
-        "name": data.get("name") or "",
-        "phone": data.get("phone") or "",
-        "email": data.get("email") or "",
-        "notes": data.get("notes") or "",
-        "sms_body": sms_body,
-        "sms_sent": "true" if sms_sent else "false",
-    }
-    with REVIEWS_CSV_PATH.open("a", newline="", encoding="utf-8") as f:
-        w = csv.DictWriter(f, fieldnames=REVIEWS_FIELDS)
-        if new_file:
-            w.writeheader()
-        w.writerow(row)
+    row = [  # REVIEWS_FIELDS order
+        _new_id(),
+        _now_iso(),
+        source,
+        data.get("job_id") or "",
+        data.get("name") or "",
+        data.get("phone") or "",
+        data.get("email") or "",
+        data.get("notes") or "",
+        sms_body,
+        "true" if sms_sent else "false",
+    ]
+    _enqueue_row(REVIEWS_CSV_PATH, REVIEWS_FIELDS, row)
 
 # Backwards-compat alias if any code calls storage.save_review(...)
 save_review = save_review_request
 
 
 def read_reviews(limit: int = 20) -> list[dict]:
-    if not REVIEWS_CSV_PATH.exists():
-        return []
-    with REVIEWS_CSV_PATH.open("r", newline="", encoding="utf-8") as f:
-        rows = list(csv.DictReader(f))
-    return list(reversed(rows))[:max(0, limit)]
+    return _read_latest(REVIEWS_CSV_PATH, limit)
 
 
 # --------------------------------------------------------------------------------------
 # Reminders sent CSV (CSV-only tracking; DB-first lives in models)
 # --------------------------------------------------------------------------------------
 
+# (phone, start_time_local, offset) keys already in reminders_sent.csv, kept
+# current the same way as _RECENT_SENDS.
+_SENT_KEYS: set[tuple[str, str, str]] = set()
+_SENT_TAIL = _CsvTail()
+_SENT_LOCK = threading.Lock()
+
+
+def _refresh_sent_keys() -> None:
+    """Ingest rows appended to CSV_REMINDERS_SENT since the last call (caller holds _SENT_LOCK)."""
+    reset, rows = _SENT_TAIL.read_new(CSV_REMINDERS_SENT, REMINDER_SENT_FIELDS)
+    if reset:
+        _SENT_KEYS.clear()
+
+    cols = _SENT_TAIL.cols
+    i_phone = cols.get("phone")
+    i_start = cols.get("start_time_local")
+    i_offset = cols.get("offset")
+    if i_phone is None or i_start is None or i_offset is None:
+        return
+    width = max(i_phone, i_start, i_offset)
+
+    for row in rows:
+        if len(row) > width:
+            _SENT_KEYS.add((row[i_phone], row[i_start], row[i_offset]))
+
+
 def reminder_already_sent(phone: str, start_time_local: str, offset: str) -> bool:
-    if not CSV_REMINDERS_SENT.exists():
-        return False
-    try:
-        with CSV_REMINDERS_SENT.open("r", newline="", encoding="utf-8") as f:
-            for row in csv.DictReader(f):
-                if (
-                    row.get("phone") == phone
-                    and row.get("start_time_local") == start_time_local
-                    and row.get("offset") == offset
-                ):
-                    return True
-    except Exception:
-        return False
-    return False
+    with _SENT_LOCK:
+        try:
+            _refresh_sent_keys()
+        except Exception:
+            pass
+        return (phone, start_time_local, offset) in _SENT_KEYS
 
 
 def save_reminder_sent(phone: str, start_time_local: str, offset: str) -> None:
-    new_file = not CSV_REMINDERS_SENT.exists() or CSV_REMINDERS_SENT.stat().st_size == 0
-    row = {
-        "sent_id": str(uuid.uuid4()),
-        "created_at": datetime.now(timezone.utc)
-    .isoformat(timespec="seconds")
-    .replace("+00:00", "Z"),
-
-        "phone": phone,
-        "start_time_local": start_time_local,
-        "offset": offset,
-    }
-    with CSV_REMINDERS_SENT.open("a", newline="", encoding="utf-8") as f:
-        w = csv.DictWriter(f, fieldnames=REMINDER_SENT_FIELDS)
-        if new_file:
-            w.writeheader()
-        w.writerow(row)
+    row = [_new_id(), _now_iso(), phone, start_time_local, offset]  # REMINDER_SENT_FIELDS order
+    with _SENT_LOCK:
+        _SENT_KEYS.add((phone, start_time_local, offset))
+    _enqueue_row(CSV_REMINDERS_SENT, REMINDER_SENT_FIELDS, row)
 
 
 def read_reminders_sent(limit: int = 50) -> list[dict]:
-    if not CSV_REMINDERS_SENT.exists():
-        return []
-    with CSV_REMINDERS_SENT.open("r", newline="", encoding="utf-8") as f:
-        rows = list(csv.DictReader(f))
-    return list(reversed(rows))[:max(0, limit)]
+    return _read_latest(CSV_REMINDERS_SENT, limit)
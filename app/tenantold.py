@@ -1,4 +1,5 @@
-from typing import Any, Dict, Optional
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
 
 from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
@@ -9,6 +10,7 @@ from app import config
 from app.db import get_session
 from app.deps import get_tenant_id
 from app.models import Tenant
+from app.services.sms import invalidate_brand
 
 router = APIRouter(prefix="/tenant", tags=["tenant"])
 
@@ -70,23 +72,15 @@ def review_link(tenant_id: str, db: "Optional[object]" = None) -> Optional[str]:
     return None
 
 
-def brand(tenant_id: str, db: Optional[Session] = None) -> Dict[str, Any]:
+@lru_cache(maxsize=64)
+def _config_brand(tenant_id: str) -> Tuple[Any, Any, Optional[str], Any, Any]:
     """
-    Return branding with keys:
-      - FROM_NAME
-      - BOOKING_LINK
-      - REVIEW_GOOGLE_URL
-      - OFFICE_SMS_TO
-      - OFFICE_EMAIL_TO
-
-    Priority:
-      1) TENANT_BRANDS[tenant_id][KEY]
-      2) Global config / settings
-      3) DB Tenant row (if db session provided)
+    Config-only branding for a tenant (TENANT_BRANDS overrides, then global config).
+    Config doesn't change at runtime, so this is resolved once per tenant;
+    DB overrides are still applied per call in brand().
     """
     overrides = _tenant_overrides().get(tenant_id, {})
 
-    # 1) base values from overrides / global config
     FROM_NAME = (
         overrides.get("FROM_NAME")
         or getattr(config, "FROM_NAME", None)
@@ -111,7 +105,7 @@ def brand(tenant_id: str, db: Optional[Session] = None) -> Dict[str, Any]:
     if isinstance(override_or_global_review, str) and override_or_global_review.strip():
         review_url = override_or_global_review.strip()
     else:
-        review_url = review_link(tenant_id, db=db)
+        review_url = None
 
     office_sms = (
         overrides.get("OFFICE_SMS_TO")
@@ -125,6 +119,28 @@ def brand(tenant_id: str, db: Optional[Session] = None) -> Dict[str, Any]:
         or getattr(getattr(config, "settings", object()), "OFFICE_EMAIL_TO", None)
     )
 
+    return FROM_NAME, BOOKING_LINK, review_url, office_sms, office_email
+
+
+def brand(tenant_id: str, db: Optional[Session] = None) -> Dict[str, Any]:
+    """
+    Return branding with keys:
+      - FROM_NAME
+      - BOOKING_LINK
+      - REVIEW_GOOGLE_URL
+      - OFFICE_SMS_TO
+      - OFFICE_EMAIL_TO
+
+    Priority:
+      1) TENANT_BRANDS[tenant_id][KEY]
+      2) Global config / settings
+      3) DB Tenant row (if db session provided)
+    """
+    # 1) base values from overrides / global config (cached per tenant)
+    FROM_NAME, BOOKING_LINK, review_url, office_sms, office_email = _config_brand(tenant_id)
+    if review_url is None:
+        review_url = review_link(tenant_id, db=db)
+
     # 2) DB overrides if a Session is provided
     if db is not None:
         try:
@@ -185,6 +201,7 @@ def set_place_id(body: PlaceIdIn, db: Session = Depends(get_session)):
     )
     db.add(t)
     db.commit()
+    invalidate_brand(t.slug)
     db.refresh(t)
 
     return {
@@ -209,6 +226,7 @@ def set_review_url(body: ReviewUrlIn, db: Session = Depends(get_session)):
     t.review_google_url = body.review_google_url.strip()
     db.add(t)
     db.commit()
+    invalidate_brand(t.slug)
     db.refresh(t)
 
     return {
@@ -263,6 +281,7 @@ def update_tenant_settings(
 
     db.add(t)
     db.commit()
+    invalidate_brand(t.slug)
     db.refresh(t)
 
     return {"ok": True, "tenant": t.slug, "updated": data}
@@ -1,16 +1,50 @@
 # app/utils/phone.py
+import re
+from functools import lru_cache
+from typing import Optional
+
 import phonenumbers
 from fastapi import HTTPException
 
+
+@lru_cache(maxsize=4096)
+def _e164_or_none(raw: str) -> Optional[str]:
+    # Cached: the same caller / tenant numbers are normalized on every webhook.
+    try:
+        pn = phonenumbers.parse(raw, "US")
+    except Exception:
+        return None
+    if not phonenumbers.is_possible_number(pn) or not phonenumbers.is_valid_number(pn):
+        return None
+    return phonenumbers.format_number(pn, phonenumbers.PhoneNumberFormat.E164)
+
+
+# Punctuation people type around US numbers; stripped before the cache lookup so
+# "(814) 555-1234", "814.555.1234" and "+1 814 555 1234" share one entry.
+_PUNCT = str.maketrans("", "", "()-. \t")
+# Only valid NANP shapes (NXX-NXX-XXXX) take the fast path; anything else — e.g.
+# 011-prefixed international dialing — goes to phonenumbers unchanged.
+_US_SHAPE = re.compile(r"(?:\+1|1)?([2-9]\d{2}[2-9]\d{6})")
+
+
+def _to_e164(raw: str) -> Optional[str]:
+    m = _US_SHAPE.fullmatch(raw.translate(_PUNCT))
+    return _e164_or_none("+1" + m.group(1) if m else raw)
+
+
 def normalize_us_phone(raw: str) -> str:
     """
     Normalize US/CA numbers to E.164 (+1XXXXXXXXXX).
     Raise 422 if invalid so the API returns a clean error.
     """
-    try:
-        pn = phonenumbers.parse(raw, "US")
-        if not phonenumbers.is_possible_number(pn) or not phonenumbers.is_valid_number(pn):
-            raise ValueError("invalid")
-        return phonenumbers.format_number(pn, phonenumbers.PhoneNumberFormat.E164)
-    except Exception:
-        raise HTTPException(status_code=422, detail="Invalid phone number. Use format like +18145551234.")
\ No newline at end of file
+    e164 = _to_e164(raw) if isinstance(raw, str) else None
+    if e164 is None:
+        raise HTTPException(status_code=422, detail="Invalid phone number. Use format like +18145551234.")
+    return e164
+
+
+def try_normalize_us_phone(raw: Optional[str]) -> Optional[str]:
+    """Like normalize_us_phone, but returns None instead of raising (for webhook fields)."""
+    if not raw or not isinstance(raw, str):
+        return None
+    return _to_e164(raw)
@@ -0,0 +1,24 @@
+# app/utils/responses.py
+import orjson
+from starlette.responses import JSONResponse
+
+
+class ORJSONResponse(JSONResponse):
+    """
+    JSON response rendered with orjson (used as the app-wide default).
+
+    Raw datetimes are emitted as UTC ISO strings with a trailing 'Z'
+    (naive values are treated as UTC), to the second:
+      2025-01-31T14:05:00Z
+    """
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(
+            content,
+            option=(
+                orjson.OPT_NON_STR_KEYS
+                | orjson.OPT_NAIVE_UTC
+                | orjson.OPT_UTC_Z
+                | orjson.OPT_OMIT_MICROSECONDS
+            ),
+        )
@@ -12,8 +12,8 @@ c = Client(
     os.getenv("TWILIO_ACCOUNT_SID"),
 )
 
-# show the last few outbound messages
-for m in c.messages.list(limit=5):
+# show the last few outbound messages (one 5-row page, streamed)
+for m in c.messages.stream(limit=5, page_size=5):
     print(
         m.sid,
         "status:", m.status,
@@ -1,20 +1,41 @@
 ﻿import sqlite3, json
 db = "data/app.db"
-con = sqlite3.connect(db)
+# autocommit: read-only script, no implicit BEGIN
+con = sqlite3.connect(db, isolation_level=None)
 cur = con.cursor()
 
+# create SQL + columns in one round-trip; SQLite builds the JSON
+row = cur.execute(
+    """
+    SELECT m.sql,
+           (SELECT json_group_array(json_object(
+                       'cid', cid, 'name', name, 'type', type,
+                       'notnull', "notnull", 'dflt_value', dflt_value, 'pk', pk))
+              FROM pragma_table_info('tenant'))
+      FROM sqlite_master m
+     WHERE m.type = 'table' AND m.name = 'tenant'
+    """
+).fetchone()
+
 print("== create SQL ==")
-row = cur.execute("SELECT sql FROM sqlite_master WHERE type='table' AND name='tenant'").fetchone()
-print(row[0] if row else "tenant table not found")
+if not row:
+    print("tenant table not found")
+    con.close()
+    raise SystemExit(0)
+print(row[0])
 
+cols = json.loads(row[1])
 print("\n== columns ==")
-cols = cur.execute("PRAGMA table_info(tenant)").fetchall()
-# each: (cid, name, type, notnull, dflt_value, pk)
-for c in cols:
-    print(c)
+print(json.dumps(cols, indent=2))
 
 print("\n== current rows (first 5) ==")
-rows = cur.execute("SELECT * FROM tenant LIMIT 5").fetchall()
-print(rows)
+pairs = ", ".join(
+    "'{0}', \"{1}\"".format(c["name"].replace("'", "''"), c["name"].replace('"', '""'))
+    for c in cols
+)
+rows = cur.execute(
+    f"SELECT json_group_array(json_object({pairs})) FROM (SELECT * FROM tenant LIMIT 5)"
+).fetchone()[0]
+print(json.dumps(json.loads(rows), indent=2, default=str))
 
 con.close()
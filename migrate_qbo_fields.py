@@ -5,8 +5,7 @@ conn = sqlite3.connect(db_path)
 cur = conn.cursor()
 
 # Read existing columns
-cur.execute("PRAGMA table_info(tenant)")
-existing = {row[1] for row in cur.fetchall()}
+existing = {row[1] for row in cur.execute("PRAGMA table_info(tenant)")}
 
 def add_col(name, sql_type):
     if name not in existing:
@@ -15,6 +14,8 @@ def add_col(name, sql_type):
     else:
         print(f"Column {name} already exists")
 
+# One transaction for all ALTERs (sqlite3 doesn't open one for DDL on its own)
+cur.execute("BEGIN IMMEDIATE")
 add_col("qbo_realm_id", "TEXT")
 add_col("qbo_access_token", "TEXT")
 add_col("qbo_refresh_token", "TEXT")
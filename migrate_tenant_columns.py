@@ -16,9 +16,8 @@ TARGET_COLUMNS = {
 
 def get_existing_columns() -> set[str]:
     with engine.connect() as conn:
-        result = conn.execute(text("PRAGMA table_info(tenant);"))
-        cols = [row[1] for row in result.fetchall()]  # row[1] = column name
-    return set(cols)
+        # row[1] = column name; stream the cursor straight into the set
+        return {row[1] for row in conn.execute(text("PRAGMA table_info(tenant);"))}
 
 
 def add_missing_columns():
@@ -26,6 +25,8 @@ def add_missing_columns():
     print("[INFO] Existing tenant columns:", existing)
 
     with engine.connect() as conn:
+        # all ALTERs in one transaction (pysqlite won't open one for DDL itself)
+        conn.exec_driver_sql("BEGIN IMMEDIATE")
         for col_name, col_type in TARGET_COLUMNS.items():
             if col_name in existing:
                 print(f"[SKIP] Column '{col_name}' already exists.")
@@ -0,0 +1,29 @@
+"""add (tenant_id, phone, template, booking_start) index on remindersent
+
+Revision ID: a4b5c6d7e8f9
+Revises: f3a4b5c6d7e8
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = 'a4b5c6d7e8f9'
+down_revision: Union[str, Sequence[str], None] = 'f3a4b5c6d7e8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_remindersent_dedupe',
+        'remindersent',
+        ['tenant_id', 'phone', 'template', 'booking_start'],
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_remindersent_dedupe', table_name='remindersent', if_exists=True)
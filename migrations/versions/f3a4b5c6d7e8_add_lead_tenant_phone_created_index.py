@@ -0,0 +1,30 @@
+"""add (tenant_id, phone, created_at DESC) index on lead
+
+Revision ID: f3a4b5c6d7e8
+Revises: e2f3a4b5c6d7
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'f3a4b5c6d7e8'
+down_revision: Union[str, Sequence[str], None] = 'e2f3a4b5c6d7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_lead_tenant_phone_created',
+        'lead',
+        ['tenant_id', 'phone', sa.text('created_at DESC')],
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_lead_tenant_phone_created', table_name='lead', if_exists=True)
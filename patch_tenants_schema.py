@@ -4,8 +4,7 @@ from app.db import engine
 def main():
     with engine.begin() as conn:
         # See what columns already exist
-        rows = conn.exec_driver_sql("PRAGMA table_info(tenants)").all()
-        existing_cols = {row[1] for row in rows}
+        existing_cols = {row[1] for row in conn.exec_driver_sql("PRAGMA table_info(tenants)")}
         print("Existing columns on tenants:", existing_cols)
 
         # Columns we need
@@ -0,0 +1,50 @@
+import os
+import sqlite3
+
+# Pure DDL against SQLite (PRAGMA table_info), so stdlib sqlite3 is enough:
+# no app.db import, which would pull in SQLAlchemy, SQLModel and app.models.
+
+# tenant columns the older scripts added one by one; ADD COLUMN only, never drops
+DESIRED = {
+    "business_name": "TEXT DEFAULT ''",
+    "website": "TEXT DEFAULT ''",
+    "address": "TEXT DEFAULT ''",
+    "review_google_url": "TEXT DEFAULT ''",
+}
+
+
+def db_path() -> str:
+    """DB_PATH if set, else the file behind a sqlite:/// DATABASE_URL."""
+    path = os.getenv("DB_PATH", "")
+    if path:
+        return path
+    url = os.getenv("DATABASE_URL", "")
+    if not url.startswith("sqlite:///"):
+        raise SystemExit("set DB_PATH, or DATABASE_URL to a sqlite:/// URL")
+    return url[len("sqlite:///"):]
+
+
+def main(only=None):
+    """Add any missing DESIRED columns (or just `only`) in one transaction."""
+    wanted = {c: DESIRED[c] for c in (only or DESIRED)}
+
+    con = sqlite3.connect(db_path(), isolation_level=None)
+    try:
+        existing = {r[1] for r in con.execute("PRAGMA table_info(tenant);")}
+
+        con.execute("PRAGMA synchronous=NORMAL")
+        con.execute("BEGIN IMMEDIATE")
+        for col, ddl in wanted.items():
+            if col not in existing:
+                con.execute(f"ALTER TABLE tenant ADD COLUMN {col} {ddl};")
+                print(f"✅ Added column: {col}")
+            else:
+                print(f"ℹ️ Column exists: {col}")
+
+        con.execute("COMMIT")
+    finally:
+        con.close()
+
+
+if __name__ == "__main__":
+    main()
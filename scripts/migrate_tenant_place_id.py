@@ -2,9 +2,10 @@ from sqlalchemy import text
 from app.db import engine
 
 with engine.connect() as conn:
-    conn = conn.execution_options(isolation_level="AUTOCOMMIT")
-    cols = [r[1] for r in conn.execute(text("PRAGMA table_info(tenant);")).fetchall()]
+    cols = {r[1] for r in conn.execute(text("PRAGMA table_info(tenant);"))}
 
+    # all ALTERs in one transaction instead of autocommitting each
+    conn.exec_driver_sql("BEGIN IMMEDIATE")
     for col, ddl in [
         ("business_name", "TEXT DEFAULT ''"),
         ("website", "TEXT DEFAULT ''"),
@@ -15,3 +16,5 @@ with engine.connect() as conn:
             print(f"✅ Added column: {col}")
         else:
             print(f"ℹ️ Column exists: {col}")
+
+    conn.commit()
@@ -1,16 +1,9 @@
 import sys
 from pathlib import Path
-sys.path.append(str(Path(__file__).resolve().parents[1]))
 
-from sqlalchemy import text
-from app.db import engine
+# kept for old instructions; the column list lives in migrate_tenant.py
+sys.path.append(str(Path(__file__).resolve().parent))
 
-with engine.connect() as conn:
-    conn = conn.execution_options(isolation_level="AUTOCOMMIT")
-    cols = [r[1] for r in conn.execute(text("PRAGMA table_info(tenant);")).fetchall()]
+from migrate_tenant import main
 
-    if "review_google_url" not in cols:
-        conn.execute(text("ALTER TABLE tenant ADD COLUMN review_google_url TEXT DEFAULT '';"))
-        print("✅ Added column: review_google_url")
-    else:
-        print("ℹ️ Column exists: review_google_url")
+main(["review_google_url"])
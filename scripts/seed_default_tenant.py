@@ -1,16 +1,48 @@
-﻿import sys
-from pathlib import Path
-sys.path.append(str(Path(__file__).resolve().parents[1]))
-
-from sqlmodel import Session, select
-from app.db import engine
-from app.models import Tenant
-
-with Session(engine) as s:
-    t = s.exec(select(Tenant).where(Tenant.slug=="default")).first()
-    if not t:
-        s.add(Tenant(name="Default", slug="default", is_active=True))
-        s.commit()
+﻿import os
+
+from sqlalchemy import create_engine, text
+
+# Plain SQLAlchemy Core: skips importing app.db/app.models (SQLModel, pydantic,
+# the whole model registry) for one insert.
+
+# Mirrors Tenant's Python-side defaults; ON CONFLICT folds the exists check into
+# the insert (SQLite >= 3.24 and Postgres both support it on the unique slug).
+INSERT = text(
+    """
+    INSERT INTO tenant (
+        name, slug, created_at, is_active, is_admin,
+        business_name, website, address, google_place_id, review_google_url,
+        email, phone, booking_link, office_sms_to, office_email_to,
+        timezone, twilio_number, assistant_status, carrier_setup_complete,
+        gcal_calendar_id
+    ) VALUES (
+        :name, :slug, CURRENT_TIMESTAMP, TRUE, FALSE,
+        :business_name, :website, '', '', '',
+        '', '', '', '', '',
+        'America/New_York', '', 'active', FALSE,
+        'primary'
+    )
+    ON CONFLICT (slug) DO NOTHING
+    """
+)
+
+DEFAULT = {"name": "Default", "slug": "default", "business_name": "", "website": ""}
+
+
+def get_engine():
+    url = os.getenv("DATABASE_URL", "")
+    if not url:
+        raise SystemExit("DATABASE_URL environment variable is not set")
+    if url.startswith("postgres://"):
+        url = url.replace("postgres://", "postgresql://", 1)
+    return create_engine(url)
+
+
+if __name__ == "__main__":
+    with get_engine().begin() as conn:
+        created = conn.execute(INSERT, DEFAULT).rowcount
+
+    if created:
         print("✅ created tenant: default")
     else:
-        print("✅ tenant exists:", t.slug)
+        print("✅ tenant exists: default")
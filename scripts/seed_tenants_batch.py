@@ -0,0 +1,27 @@
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent))
+
+from seed_default_tenant import DEFAULT, INSERT, get_engine
+
+# Everything a local/test DB needs, seeded with one executemany in one transaction
+ROWS = [
+    DEFAULT,
+    {
+        "name": "",
+        "slug": "test-tenant",
+        "business_name": "Test HVAC Pro",
+        "website": "https://testhvac.com",
+    },
+]
+
+
+def main(rows=ROWS):
+    with get_engine().begin() as conn:
+        conn.execute(INSERT, rows)
+    print("✅ tenants seeded:", ", ".join(r["slug"] for r in rows))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,10 @@
-﻿from sqlmodel import Session, select
-from sqlalchemy import text
-from app.db import engine
-from app.models import Tenant
+﻿import runpy
+from pathlib import Path
 
-with Session(engine) as s:
-    t = s.exec(select(Tenant).where(Tenant.id == "default")).first()
-    if not t:
-        s.exec(text("INSERT OR IGNORE INTO tenant (id) VALUES ('default')"))
-        s.commit()
+# The tenant schema is known here, so no PRAGMA introspection: the single
+# INSERT .. ON CONFLICT(slug) DO NOTHING lives in scripts/seed_default_tenant.py.
+# (The old INSERT OR IGNORE put 'default' into the integer id and failed.)
+runpy.run_path(
+    str(Path(__file__).resolve().parent / "scripts" / "seed_default_tenant.py"), run_name="__main__"
+)
 print("tenant ok")
@@ -1,42 +1,46 @@
 # seed_test_tenant.py
 
-from sqlmodel import Session, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlmodel import Session
 from app.db import engine
 from app.models import Tenant
 
 
 def main():
+    # Create a basic tenant record
+    t = Tenant(
+        slug="test-tenant",
+        business_name="Test HVAC Pro",
+        website="https://testhvac.com",
+        address=None,
+        email=None,
+        phone=None,
+        booking_link=None,
+        office_sms_to=None,
+        office_email_to=None,
+        google_place_id=None,
+        review_google_url=None,
+    )
+
     with Session(engine) as session:
-        # check if tenant already exists
-        existing = session.exec(
-            select(Tenant).where(Tenant.slug == "test-tenant")
-        ).first()
-
-        if existing:
-            print("[SKIP] Tenant 'test-tenant' already exists.")
-            print(existing)
-            return
-
-        # Create a basic tenant record
-        t = Tenant(
-            slug="test-tenant",
-            business_name="Test HVAC Pro",
-            website="https://testhvac.com",
-            address=None,
-            email=None,
-            phone=None,
-            booking_link=None,
-            office_sms_to=None,
-            office_email_to=None,
-            google_place_id=None,
-            review_google_url=None,
+        # one INSERT .. ON CONFLICT(slug) DO NOTHING instead of SELECT then INSERT
+        insert = sqlite_insert if engine.dialect.name == "sqlite" else pg_insert
+        stmt = (
+            insert(Tenant)
+            .values(**t.model_dump(exclude={"id"}))
+            .on_conflict_do_nothing(index_elements=["slug"])
+            .returning(Tenant.id)
         )
-
-        session.add(t)
+        new_id = session.exec(stmt).scalar()
         session.commit()
-        session.refresh(t)
 
-        print("[ADDED] Tenant created:", t)
+    if new_id is None:
+        print("[SKIP] Tenant 'test-tenant' already exists.")
+        return
+
+    t.id = new_id
+    print("[ADDED] Tenant created:", t)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,46 @@
+# seeds/__main__.py
+"""
+Run several tenant seeds in one interpreter:
+
+    python -m seeds default test-tenant
+    python -m seeds default-dynamic --db data/app.db
+"""
+import argparse
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path[:0] = [str(ROOT), str(ROOT / "scripts")]
+
+from _tenant_schema import connect, seed_tenant  # noqa: E402
+from seed_default_tenant import INSERT, get_engine  # noqa: E402
+from seed_tenants_batch import ROWS  # noqa: E402
+
+# known-shape rows, seeded with one executemany on DATABASE_URL
+KNOWN = {r["slug"]: r for r in ROWS}
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(prog="python -m seeds")
+    p.add_argument("names", nargs="+", choices=[*KNOWN, "default-dynamic"])
+    p.add_argument("--db", default="data/app.db", help="SQLite file for default-dynamic")
+    args = p.parse_args(argv)
+
+    names = list(dict.fromkeys(args.names))
+    rows = [KNOWN[n] for n in names if n in KNOWN]
+    if rows:
+        with get_engine().begin() as conn:
+            conn.execute(INSERT, rows)
+        print("✅ tenants seeded:", ", ".join(r["slug"] for r in rows))
+
+    # schema-introspecting seed for older SQLite files (seed_tenant_dynamic.py)
+    if "default-dynamic" in names:
+        con = connect(args.db)
+        try:
+            seed_tenant(con, "default")
+        finally:
+            con.close()
+
+
+if __name__ == "__main__":
+    main()
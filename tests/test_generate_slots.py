@@ -0,0 +1,132 @@
+"""
+Regression test for google_calendar.generate_slots (sweep / bisect / HH:MM fast path).
+Compares against the original brute-force slot loop, kept here as the reference.
+Run: python tests/test_generate_slots.py
+"""
+import sys, os
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+import random
+from datetime import datetime, timedelta, time as dtime, timezone
+from zoneinfo import ZoneInfo
+
+from app.services.google_calendar import generate_slots
+
+FAIL = []
+
+def check(label, got, expected):
+    if got != expected:
+        FAIL.append(f"FAIL [{label}]: got {got!r}, expected {expected!r}")
+    else:
+        print(f"  OK  [{label}]")
+
+
+def reference_slots(*, start, end, tz_str, busy, business_hours, slot_minutes, buffer_minutes=0):
+    """The original implementation: every slot checked against every busy block."""
+    local = ZoneInfo(tz_str)
+    start = (start if start.tzinfo else start.replace(tzinfo=timezone.utc)).astimezone(local)
+    end = (end if end.tzinfo else end.replace(tzinfo=timezone.utc)).astimezone(local)
+    bh_start_s, bh_end_s = business_hours.split("-")
+    bh_start = dtime.fromisoformat(bh_start_s)
+    bh_end = dtime.fromisoformat(bh_end_s)
+    buf = timedelta(minutes=buffer_minutes)
+    expanded = []
+    for s, e in busy:
+        s = (s if s.tzinfo else s.replace(tzinfo=timezone.utc)).astimezone(local) - buf
+        e = (e if e.tzinfo else e.replace(tzinfo=timezone.utc)).astimezone(local) + buf
+        expanded.append((s, e))
+    out = []
+    day = start.date()
+    while day <= end.date():
+        cur = max(datetime.combine(day, bh_start, tzinfo=local), start)
+        stop = min(datetime.combine(day, bh_end, tzinfo=local), end)
+        while cur + timedelta(minutes=slot_minutes) <= stop:
+            slot_end = cur + timedelta(minutes=slot_minutes)
+            if not any(not (slot_end <= bs or cur >= be) for bs, be in expanded):
+                out.append({"start": cur.isoformat(), "end": slot_end.isoformat()})
+            cur += timedelta(minutes=slot_minutes)
+        day += timedelta(days=1)
+    return out
+
+
+def same(label, **kw):
+    check(label, generate_slots(**kw), reference_slots(**kw))
+
+
+UTC = timezone.utc
+NY = "America/New_York"
+
+# ── DST: spring forward / fall back inside the range ───────────────────
+same("DST spring forward (NY)",
+     start=datetime(2025, 3, 7, 12, tzinfo=UTC), end=datetime(2025, 3, 11, 23, tzinfo=UTC),
+     tz_str=NY, busy=[(datetime(2025, 3, 10, 14, tzinfo=UTC), datetime(2025, 3, 10, 15, 30, tzinfo=UTC))],
+     business_hours="08:00-17:00", slot_minutes=60)
+same("DST fall back (NY)",
+     start=datetime(2025, 10, 31, 12, tzinfo=UTC), end=datetime(2025, 11, 4, 23, tzinfo=UTC),
+     tz_str=NY, busy=[], business_hours="00:30-03:30", slot_minutes=30)
+# business hours spanning the 2am switch itself
+same("DST switch inside business hours",
+     start=datetime(2025, 3, 9, 0, tzinfo=UTC), end=datetime(2025, 3, 10, 0, tzinfo=UTC),
+     tz_str=NY, busy=[], business_hours="01:00-04:00", slot_minutes=30)
+
+# ── half-hour / 45-minute offsets ──────────────────────────────────────
+same("half-hour offset (Kolkata)",
+     start=datetime(2025, 6, 2, 0, tzinfo=UTC), end=datetime(2025, 6, 4, 0, tzinfo=UTC),
+     tz_str="Asia/Kolkata", busy=[(datetime(2025, 6, 2, 5, 15, tzinfo=UTC), datetime(2025, 6, 2, 6, tzinfo=UTC))],
+     business_hours="09:00-18:00", slot_minutes=45, buffer_minutes=10)
+same("half-hour offset + DST (Adelaide)",
+     start=datetime(2025, 4, 4, 0, tzinfo=UTC), end=datetime(2025, 4, 7, 0, tzinfo=UTC),
+     tz_str="Australia/Adelaide", busy=[], business_hours="09:00-17:00", slot_minutes=60)
+same("45-minute offset (Kathmandu)",
+     start=datetime(2025, 6, 2, 0, tzinfo=UTC), end=datetime(2025, 6, 3, 0, tzinfo=UTC),
+     tz_str="Asia/Kathmandu", busy=[], business_hours="10:00-16:00", slot_minutes=90)
+
+# ── odd starts: mid-slot, seconds/microseconds, naive inputs ───────────
+same("odd start with seconds",
+     start=datetime(2025, 6, 2, 13, 7, 30, 250, tzinfo=UTC), end=datetime(2025, 6, 3, 22, tzinfo=UTC),
+     tz_str=NY, busy=[(datetime(2025, 6, 2, 15, tzinfo=UTC), datetime(2025, 6, 2, 16, tzinfo=UTC))],
+     business_hours="09:00-17:00", slot_minutes=30)
+same("naive start/end/busy treated as UTC",
+     start=datetime(2025, 6, 2, 12), end=datetime(2025, 6, 2, 23),
+     tz_str=NY, busy=[(datetime(2025, 6, 2, 14), datetime(2025, 6, 2, 14, 20))],
+     business_hours="08:00-18:00", slot_minutes=60)
+same("overnight busy block spanning days",
+     start=datetime(2025, 6, 2, 0, tzinfo=UTC), end=datetime(2025, 6, 5, 0, tzinfo=UTC),
+     tz_str=NY, busy=[(datetime(2025, 6, 2, 20, tzinfo=UTC), datetime(2025, 6, 3, 15, tzinfo=UTC)),
+                      (datetime(2025, 6, 3, 14, tzinfo=UTC), datetime(2025, 6, 3, 16, tzinfo=UTC))],
+     business_hours="08:00-17:00", slot_minutes=60, buffer_minutes=15)
+
+check("spot check: first NY slot",
+      generate_slots(start=datetime(2025, 6, 2, 12, tzinfo=UTC), end=datetime(2025, 6, 2, 14, tzinfo=UTC),
+                     tz_str=NY, busy=[], business_hours="08:00-17:00", slot_minutes=60)[0],
+      {"start": "2025-06-02T08:00:00-04:00", "end": "2025-06-02T09:00:00-04:00"})
+
+# ── randomized sweep across the same zones ─────────────────────────────
+rng = random.Random(1234)
+zones = [NY, "Asia/Kolkata", "Australia/Adelaide", "Asia/Kathmandu", "Europe/London", "UTC"]
+bad = 0
+for _ in range(500):
+    base = datetime(2025, rng.choice([3, 4, 10, 11]), rng.randint(1, 28), tzinfo=UTC)
+    start = base + timedelta(minutes=rng.randint(0, 1440), seconds=rng.choice([0, 0, 17]))
+    end = start + timedelta(hours=rng.randint(1, 96))
+    busy = []
+    for _ in range(rng.randint(0, 8)):
+        s = start + timedelta(minutes=rng.randint(-600, 96 * 60))
+        busy.append((s, s + timedelta(minutes=rng.randint(5, 600))))
+    h1 = rng.randint(0, 12)
+    kw = dict(start=start, end=end, tz_str=rng.choice(zones), busy=busy,
+              business_hours=f"{h1:02d}:{rng.choice(['00', '30'])}-{rng.randint(h1 + 1, 23):02d}:00",
+              slot_minutes=rng.choice([15, 30, 45, 60, 90]), buffer_minutes=rng.choice([0, 0, 10, 30]))
+    if generate_slots(**kw) != reference_slots(**kw):
+        bad += 1
+        if bad <= 3:
+            FAIL.append(f"FAIL [random]: {kw!r}")
+check("randomized sweep (500 cases) mismatches", bad, 0)
+
+if FAIL:
+    print("\n--- FAILURES ---")
+    for f in FAIL:
+        print(f)
+    sys.exit(1)
+else:
+    print("\nAll tests passed OK")
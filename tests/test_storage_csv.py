@@ -0,0 +1,138 @@
+"""
+Tests for the CSV readers in app/storage.py: the backwards record scanner
+(_iter_records_reversed / _read_latest) and the incremental _CsvTail.
+Run: python tests/test_storage_csv.py
+"""
+import sys, os
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+import csv
+import random
+import tempfile
+from pathlib import Path
+
+from app import storage
+
+FAIL = []
+
+def check(label, got, expected):
+    if got != expected:
+        FAIL.append(f"FAIL [{label}]: got {got!r}, expected {expected!r}")
+    else:
+        print(f"  OK  [{label}]")
+
+
+def forward_latest(path, limit):
+    """Reference: parse the whole file with csv.reader, newest first."""
+    with path.open("r", newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if not header:
+            return []
+        rows = list(reader)
+    return [dict(zip(header, row)) for row in reversed(rows[-limit:])] if limit > 0 else []
+
+
+def reversed_latest(path, limit, block):
+    with path.open("r", newline="", encoding="utf-8") as f:
+        header = next(csv.reader(f), None)
+    out = []
+    if not header:
+        return out
+    for record in storage._iter_records_reversed(path, block):
+        out.append(dict(zip(header, next(csv.reader([record.decode("utf-8")])))))
+        if len(out) >= limit:
+            break
+    return out
+
+
+def write_csv(path, header, rows):
+    with path.open("w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f)
+        if header:
+            w.writerow(header)
+        w.writerows(rows)
+
+
+TMP = Path(tempfile.mkdtemp())
+HEADER = ["id", "notes", "phone"]
+
+# ── reverse reader vs forward reader ───────────────────────────────────
+tricky = [
+    ["1", "plain", "+15551230001"],
+    ["2", "multi\nline\nnotes", "+15551230002"],
+    ["3", 'says "hi", then leaves', "+15551230003"],
+    ["4", "\n\"\"\n", ""],
+    ["5", "crlf\r\ninside", "+15551230005"],
+    ["6", "ünïcödé ✓", "+15551230006"],
+    ["7", "", ""],
+]
+p = TMP / "tricky.csv"
+write_csv(p, HEADER, tricky)
+for block in (1, 3, 7, 64, 65536):
+    check(f"multi-line quoted fields, block={block}", reversed_latest(p, 100, block), forward_latest(p, 100))
+check("_read_latest limit 3", storage._read_latest(p, 3), forward_latest(p, 3))
+check("_read_latest limit 0", storage._read_latest(p, 0), [])
+
+p = TMP / "header_only.csv"
+write_csv(p, HEADER, [])
+check("header-only file", storage._read_latest(p, 10), [])
+check("header-only file, tiny block", reversed_latest(p, 10, 5), [])
+
+p = TMP / "empty.csv"
+p.write_bytes(b"")
+check("empty file", storage._read_latest(p, 10), [])
+check("missing file", storage._read_latest(TMP / "nope.csv", 10), [])
+
+rng = random.Random(7)
+pieces = ["x", "multi\nline", 'q"uote', "c,omma", '\n\n""\n', "ünï", "", "\r\nx"]
+bad = 0
+for trial in range(200):
+    p = TMP / f"rand{trial}.csv"
+    write_csv(p, HEADER, [[str(i), rng.choice(pieces), "y" * rng.randrange(0, 200)]
+                          for i in range(rng.randrange(0, 40))])
+    for limit in (1, 5, 1000):
+        for block in (7, 64, 65536):
+            if reversed_latest(p, limit, block) != forward_latest(p, limit):
+                bad += 1
+check("randomized reverse vs forward mismatches", bad, 0)
+
+# ── _CsvTail: offsets, partial lines, truncation ───────────────────────
+p = TMP / "tail.csv"
+write_csv(p, HEADER, [["1", "a", "p1"], ["2", "b", "p2"]])
+tail = storage._CsvTail()
+check("tail first read", tail.read_new(p, HEADER), (False, [["1", "a", "p1"], ["2", "b", "p2"]]))
+check("tail header columns", tail.cols, {"id": 0, "notes": 1, "phone": 2})
+check("tail offset at EOF", tail.pos, p.stat().st_size)
+check("tail no new data", tail.read_new(p, HEADER), (False, []))
+
+with p.open("ab") as f:
+    f.write(b"3,c,p3\n4,d,p")   # second row is half-written
+check("tail skips half-written row", tail.read_new(p, HEADER), (False, [["3", "c", "p3"]]))
+with p.open("ab") as f:
+    f.write(b"4\n")
+check("tail picks up completed row", tail.read_new(p, HEADER), (False, [["4", "d", "p4"]]))
+
+write_csv(p, HEADER, [["9", "z", "p9"]])  # replaced with a shorter file
+check("tail truncation resets", tail.read_new(p, HEADER), (True, [["9", "z", "p9"]]))
+check("tail offset after reset", tail.pos, p.stat().st_size)
+
+other = TMP / "tail_other.csv"
+write_csv(other, ["phone", "id"], [["p5", "5"]])
+check("tail new path resets", tail.read_new(other, HEADER), (True, [["p5", "5"]]))
+check("tail new path columns", tail.cols, {"phone": 0, "id": 1})
+
+fresh = storage._CsvTail()
+check("tail missing file", fresh.read_new(TMP / "nope.csv", HEADER), (False, []))
+p = TMP / "tail_header_only.csv"
+write_csv(p, HEADER, [])
+check("tail header-only file", fresh.read_new(p, HEADER), (False, []))
+check("tail header-only columns", fresh.cols, {"id": 0, "notes": 1, "phone": 2})
+
+if FAIL:
+    print("\n--- FAILURES ---")
+    for f in FAIL:
+        print(f)
+    sys.exit(1)
+else:
+    print("\nAll tests passed OK")